@@ -0,0 +1,171 @@
+import argparse
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from driver_pool import DriverPool, DriverStartError
+from job_store import JobStore, KnownPageTracker
+from naukri_job import (build_search_keyword, create_driver, finish_selectors, generate_category_visualizations,
+                        generate_skill_visualizations, scrape_page, store_page_jobs)
+from output_manifest import OutputManifest
+from skill_aggregator import SkillAggregator
+from waits import print_wait_summary
+
+
+# One search in a batch: a role, optionally narrowed to a city and years of experience
+@dataclass(frozen=True)
+class SearchQuery:
+    role: str
+    location: str = None
+    experience: int = None
+
+    @property
+    def keyword(self):
+        return build_search_keyword(self.role, self.location, self.experience)
+
+    # A short name like "data-engineer-kolkata-3y", used in chart titles and file names
+    @property
+    def name(self):
+        parts = [self.role]
+        if self.location:
+            parts.append(self.location)
+        if self.experience is not None:
+            parts.append(f"{self.experience}y")
+        return '-'.join('-'.join(part.lower().split()) for part in parts)
+
+
+# Function to build every role x location x experience combination
+def build_query_matrix(roles, locations=None, experiences=None):
+    return [SearchQuery(role, location, experience)
+            for role, location, experience in itertools.product(roles, locations or [None], experiences or [None])]
+
+
+# Function to crawl several searches as one job, sharing a pool of browsers between them.
+# Pages are interleaved across queries (page 1 of every query, then page 2, ...) so one long
+# search doesn't starve the others, and each query stops once it reaches jobs it already found before.
+# Yields (query, job) pairs; a posting listed under several queries is yielded for each of them.
+def iter_batch_jobs(queries, num_pages, num_workers=4, store=None):
+    pool = DriverPool(create_driver, num_workers)
+    # Each query skips its pages after a run of pages it already knows
+    known_pages = {query: KnownPageTracker() for query in queries}
+
+    def scrape_with_pool(task):
+        query, page = task
+        if not known_pages[query].wanted(page):
+            return []
+        try:
+            with pool.session() as driver:
+                page_jobs = scrape_page(driver, query.keyword, page)
+        except DriverStartError:
+            # Without a browser no query can go on; end the whole batch
+            for tracker in known_pages.values():
+                tracker.stop()
+            raise
+        except Exception as e:
+            print(f"Error scraping page {page} of {query.name}: {str(e)}")
+            return []
+        if store_page_jobs(store, page, page_jobs, query.keyword, known_pages[query]):
+            print(f"{query.name} already knows every job up to page {known_pages[query].stop_after}, "
+                  f"skipping its later pages")
+        return page_jobs
+
+    tasks = [(query, page) for page in range(1, num_pages + 1) for query in queries]
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            try:
+                for (query, page), page_jobs in zip(tasks, executor.map(scrape_with_pool, tasks)):
+                    for job_info in page_jobs:
+                        yield query, job_info
+            finally:
+                # If the consumer stops early, let queued pages return without scraping
+                for tracker in known_pages.values():
+                    tracker.stop()
+    finally:
+        pool.close()
+        print_wait_summary()
+        finish_selectors()
+
+
+# Function to read back every job each query has found so far, on this run or earlier ones,
+# as (query, job) pairs like iter_batch_jobs
+def iter_stored_batch_jobs(store, queries):
+    for query in queries:
+        for job_info in store.iter_jobs(keyword=query.keyword):
+            yield query, job_info
+
+
+# Function to aggregate a batch crawl per query and combined, in one pass.
+# Each query counts a posting once; the combined totals count it once however
+# many queries it showed up under. Returns (per-query aggregators, combined
+# aggregator, number of cross-query duplicates).
+def aggregate_batch(query_jobs):
+    per_query = {}
+    seen_per_query = {}
+    combined = SkillAggregator()
+    seen = set()
+    duplicates = 0
+
+    for query, job_info in query_jobs:
+        key = job_info.key()
+        query_seen = seen_per_query.setdefault(query, set())
+        if key in query_seen:
+            continue
+        query_seen.add(key)
+        per_query.setdefault(query, SkillAggregator()).add_job(job_info.skills, job_info.skill_categories)
+
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        combined.add_job(job_info.skills, job_info.skill_categories)
+
+    return per_query, combined, duplicates
+
+
+# Main function
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl Naukri.com for several roles, cities and experience levels at once")
+    parser.add_argument('--role', action='append', dest='roles',
+                        help="job title to search for; repeat for several (default: data engineer)")
+    parser.add_argument('--location', action='append', dest='locations',
+                        help="city to search in; repeat for several (default: anywhere)")
+    parser.add_argument('--experience', action='append', dest='experiences', type=int,
+                        help="years of experience filter; repeat for several (default: none)")
+    parser.add_argument('--pages', type=int, default=10, help="results pages per search (default: 10)")
+    parser.add_argument('--workers', type=int, default=4, help="browsers shared by all searches (default: 4)")
+    args = parser.parse_args()
+
+    queries = build_query_matrix(args.roles or ['data engineer'], args.locations, args.experiences)
+    print(f"Crawling {len(queries)} searches with {args.workers} shared browsers")
+
+    os.makedirs('skill_analysis', exist_ok=True)
+    store = JobStore()
+    try:
+        scraped_count = sum(1 for _ in iter_batch_jobs(queries, args.pages, args.workers, store=store))
+        print(f"\nScraped {scraped_count} jobs this run")
+
+        # A re-run stops each query once it reaches jobs it already has, so build the charts
+        # from everything each query has found so far rather than from this run alone
+        per_query, combined, duplicates = aggregate_batch(iter_stored_batch_jobs(store, queries))
+    finally:
+        store.close()
+
+    manifest = OutputManifest()
+    print(f"{combined.total_jobs} unique jobs stored across all searches ({duplicates} listed under more than one)")
+    for query in queries:
+        aggregator = per_query.get(query)
+        if aggregator is None:
+            print(f"{query.name}: no jobs found")
+            continue
+        top_skills = ', '.join(skill for skill, _ in aggregator.skill_counts.most_common(5))
+        print(f"{query.name}: {aggregator.total_jobs} jobs; top skills: {top_skills}")
+
+        prefix = query.name.replace('-', '_')
+        generate_skill_visualizations(aggregator, query.name, prefix=prefix, manifest=manifest)
+        generate_category_visualizations(aggregator, query.name, prefix=prefix, manifest=manifest)
+
+    if combined.total_jobs:
+        generate_skill_visualizations(combined, 'all-searches', prefix='batch_combined', manifest=manifest)
+        generate_category_visualizations(combined, 'all-searches', prefix='batch_combined', manifest=manifest)
+    manifest.save()
@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_aggregator import SkillAggregator
+from skill_matcher import TAXONOMY
+
+HITS_PER_JOB = 8
+
+
+# Function to build synthetic extract_skills results adding up to total_hits skills
+def make_jobs(total_hits, seed=7):
+    rng = random.Random(seed)
+    skills = TAXONOMY.skills
+    jobs = []
+    for _ in range(total_hits // HITS_PER_JOB):
+        picked = rng.sample(skills, HITS_PER_JOB)
+        jobs.append(([name for name, _ in picked],
+                     [(name, category) for name, categories in picked for category in categories]))
+    return jobs
+
+
+# The list-and-count aggregation the __main__ block used before SkillAggregator
+def legacy_aggregate(jobs):
+    all_skills = []
+    all_skills_with_categories = []
+    for skills_only, skills_with_cats in jobs:
+        all_skills.extend(skills_only)
+        all_skills_with_categories.extend(skills_with_cats)
+    return [(skill, category, all_skills.count(skill)) for skill, category in all_skills_with_categories]
+
+
+# Function to feed every job into a fresh aggregator
+def streaming_aggregate(jobs):
+    aggregator = SkillAggregator()
+    for skills_only, skills_with_cats in jobs:
+        aggregator.add_job(skills_only, skills_with_cats)
+    return aggregator
+
+
+# Function to time one aggregation run
+def timed(aggregate, jobs):
+    start = time.perf_counter()
+    aggregate(jobs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{'skill hits':>12} {'streaming':>12} {'ns/hit':>8} {'list.count':>12}")
+    for total_hits in [10_000, 100_000, 1_000_000]:
+        jobs = make_jobs(total_hits)
+        streaming = timed(streaming_aggregate, jobs)
+        # The quadratic version is only run where it finishes in reasonable time
+        legacy = f"{timed(legacy_aggregate, jobs):.2f}s" if total_hits <= 10_000 else "skipped"
+        print(f"{total_hits:>12,} {streaming:>11.3f}s {streaming / total_hits * 1e9:>8.0f} {legacy:>12}")
@@ -0,0 +1,80 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chart_render import bar_chart_spec, plt, render_charts
+
+SKILLS_PER_CATEGORY = 8
+MODES = ['legacy', 'serial', 'pool']
+
+
+# Function to build one bar-chart spec per synthetic category, like generate_category_visualizations
+def make_specs(num_categories, output_dir):
+    specs = []
+    for i in range(num_categories):
+        labels = [f'Skill {i}.{j}' for j in range(SKILLS_PER_CATEGORY)]
+        values = [100 - 7 * j for j in range(SKILLS_PER_CATEGORY)]
+        specs.append(bar_chart_spec(f"{output_dir}/category_{i}_skills.png", labels, values,
+                                    f'Category {i} Skills for Data Engineer Jobs',
+                                    'Number of Job Listings', 'Skills', 'orange'))
+    return specs
+
+
+# The serial loop the visualization functions used before chart_render: figures are never closed
+def legacy_render(specs):
+    for spec in specs:
+        plt.figure(figsize=spec['figsize'])
+        bars = plt.barh(spec['labels'], spec['values'], color=spec['color'])
+        plt.xlabel(spec['xlabel'])
+        plt.ylabel(spec['ylabel'])
+        plt.title(spec['title'])
+        for bar in bars:
+            width = bar.get_width()
+            plt.text(width + 0.3, bar.get_y() + bar.get_height()/2, f'{width:.0f}',
+                     ha='left', va='center')
+        plt.tight_layout()
+        plt.savefig(spec['path'])
+
+
+# Function to time one mode in this process; prints "<seconds> <peak RSS in MB>"
+def run_mode(mode, num_categories):
+    with tempfile.TemporaryDirectory() as output_dir:
+        specs = make_specs(num_categories, output_dir)
+        start = time.perf_counter()
+        if mode == 'legacy':
+            legacy_render(specs)
+        else:
+            render_charts(specs, processes=1 if mode == 'serial' else None)
+        elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in KB on Linux; worker processes report under RUSAGE_CHILDREN
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(f"{elapsed:.3f} {peak / 1024:.0f} {peak_children / 1024:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--categories', type=int)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.categories)
+        sys.exit()
+
+    # Every measurement runs in a fresh process so peak RSS isn't carried over between modes
+    print(f"{'categories':>10} {'mode':>8} {'wall':>8} {'peak RSS':>9} {'worker RSS':>11}")
+    for num_categories in [15, 150]:
+        for mode in MODES:
+            output = subprocess.run([sys.executable, __file__, '--mode', mode, '--categories', str(num_categories)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            elapsed, peak, peak_children = output[-3:]
+            workers = f"{peak_children} MB" if mode == 'pool' else '-'
+            print(f"{num_categories:>10} {mode:>8} {float(elapsed):>7.2f}s {peak:>6} MB {workers:>11}")
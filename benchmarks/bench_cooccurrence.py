@@ -0,0 +1,66 @@
+import itertools
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_cooccurrence import SkillMatrix
+
+NUM_JOBS = 100_000
+NUM_SKILLS = 200
+SKILLS_PER_JOB = 8
+
+
+# Function to build synthetic skill lists with a skewed (Zipf-like) skill popularity
+def make_skill_lists(num_jobs, num_skills, seed=7):
+    rng = random.Random(seed)
+    skills = [f'Skill {i}' for i in range(num_skills)]
+    weights = [1 / (rank + 1) for rank in range(num_skills)]
+    skill_lists = []
+    for _ in range(num_jobs):
+        picked = set(rng.choices(skills, weights, k=SKILLS_PER_JOB))
+        skill_lists.append(sorted(picked))
+    return skills, skill_lists
+
+
+# The pure-Python way: count every pair per job, then compute lift per pair
+def loop_pair_stats(skill_lists):
+    skill_counts = Counter()
+    pair_counts = Counter()
+    for skills_list in skill_lists:
+        skill_counts.update(skills_list)
+        pair_counts.update(itertools.combinations(sorted(skills_list), 2))
+    total = len(skill_lists)
+    return {pair: (count, count * total / (skill_counts[pair[0]] * skill_counts[pair[1]]),
+                   math.log2(count * total / (skill_counts[pair[0]] * skill_counts[pair[1]])))
+            for pair, count in pair_counts.items()}
+
+
+# Function to time one call
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    skills, skill_lists = make_skill_lists(NUM_JOBS, NUM_SKILLS)
+    print(f"{NUM_JOBS:,} jobs x {NUM_SKILLS} skills, about {SKILLS_PER_JOB} skills per job")
+
+    skill_matrix, build = timed(SkillMatrix.from_skill_lists, skill_lists, skills)
+    _, cooccurrence = timed(skill_matrix.cooccurrence)
+    pairs, stats = timed(skill_matrix.pair_stats)
+    _, report = timed(skill_matrix.top_pairs_by_category, 10, 5, 'Lift', pairs)
+    loop_pairs, loop = timed(loop_pair_stats, skill_lists)
+
+    print(f"{'build sparse matrix':<24} {build:>7.3f}s")
+    print(f"{'co-occurrence (M.T @ M)':<24} {cooccurrence:>7.3f}s")
+    print(f"{'lift + PMI, all pairs':<24} {stats:>7.3f}s")
+    print(f"{'top-K per category':<24} {report:>7.3f}s")
+    print(f"{'python pair loop':<24} {loop:>7.3f}s")
+    print(f"pairs: {len(pairs):,} vectorised, {len(loop_pairs):,} loop; "
+          f"speedup over the loop excluding the build: {loop / (cooccurrence + stats):.1f}x")
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import naukri_job
+from bench_http_offline import FIXTURE_DIR, check_jobs
+from crawler import CrawlScheduler, is_blocked
+from http_fetch import HttpClient, HttpResponse, QuietFileHandler, serve_directory
+
+# A normal page that loads reCAPTCHA for its forms; it must not count as a bot check
+RECAPTCHA_SCRIPT = '<script src="https://www.google.com/recaptcha/api.js" async defer></script>'
+
+CAPTCHA_PAGE = b"""<!DOCTYPE html>
+<html><head><title>Security check</title></head>
+<body><h1>Are you a robot?</h1><p>Please complete the captcha below to continue.</p></body></html>
+"""
+
+
+# A fake job board serving the saved Naukri pages, pushing back the way the real site does:
+# every listing page loads reCAPTCHA like the real pages do, page 2 answers 429 and then a captcha page
+# before serving its listings. /slow and /limited are for the stop() check.
+class FakeJobBoard(QuietFileHandler):
+    hits = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        path = self.path.split('?')[0].rstrip('/')
+        with self.lock:
+            self.hits[path] += 1
+            hit = self.hits[path]
+
+        if path == '/data-engineer-jobs/page-2' and hit == 1:
+            self.send_page(429, b'Too many requests', {'Retry-After': '1'})
+        elif path == '/data-engineer-jobs/page-2' and hit == 2:
+            self.send_page(200, CAPTCHA_PAGE, {'Retry-After': '1'})
+        elif path.startswith('/data-engineer-jobs'):
+            with open(os.path.join(FIXTURE_DIR, path.lstrip('/'), 'index.html'), 'rb') as f:
+                body = f.read().replace(b'</head>', RECAPTCHA_SCRIPT.encode() + b'</head>')
+            self.send_page(200, body)
+        elif path == '/slow':
+            time.sleep(0.3)
+            self.send_page(200, b'<html><body>ok</body></html>')
+        elif path == '/limited':
+            self.send_page(429, b'Too many requests', {'Retry-After': '5'})
+        else:
+            super().do_GET()
+
+    def send_page(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Function to crawl the fake board with the crawler backend; returns a list of problems
+def check_crawl(base_url):
+    problems = []
+    first_job_at = None
+    jobs = []
+    start = time.perf_counter()
+    for job_info in naukri_job.iter_naukri_jobs_crawler('data-engineer', 2, concurrency=2, rate_per_host=20.0,
+                                                        base_url=base_url):
+        if first_job_at is None:
+            first_job_at = time.perf_counter() - start
+        jobs.append(job_info)
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(jobs)} jobs in {elapsed * 1000:.0f} ms, first after {first_job_at * 1000:.0f} ms")
+
+    # Pages are yielded as they're fetched; the saved listings' links end in their position
+    problems += check_jobs(sorted(jobs, key=lambda job_info: int(job_info.link.rsplit('-', 1)[1])))
+    if FakeJobBoard.hits['/data-engineer-jobs'] != 1:
+        problems.append("page 1, which loads reCAPTCHA, was treated as blocked and retried")
+    if FakeJobBoard.hits['/data-engineer-jobs/page-2'] != 3:
+        problems.append(f"page 2 should take 3 requests (429, captcha, listings), "
+                        f"took {FakeJobBoard.hits['/data-engineer-jobs/page-2']}")
+    # Page 2 waits out two 1 s backoffs; page 1's jobs must not wait for it
+    if first_job_at is None or first_job_at > 1.0:
+        problems.append("page 1's jobs were held back until the whole crawl finished")
+    return problems
+
+
+# Function to stop a crawl while a request waits to be retried; returns a list of problems
+def check_stop(base_url):
+    problems = []
+
+    def stop_stage(response, request, scheduler):
+        scheduler.stop()
+
+    client = HttpClient()
+    scheduler = CrawlScheduler(client, {'slow': stop_stage}, rate_per_host=20.0)
+    scheduler.add(f"{base_url}/limited", 'slow')
+    scheduler.add(f"{base_url}/slow", 'slow')
+    start = time.perf_counter()
+    try:
+        asyncio.run(scheduler.run())
+    finally:
+        client.close()
+    elapsed = time.perf_counter() - start
+
+    if [request.url for request in scheduler.failed] != [f"{base_url}/limited"]:
+        problems.append("a request waiting to be retried when the crawl stopped wasn't moved to failed")
+    if elapsed > 2:
+        problems.append(f"stop() didn't cancel the pending retry; the crawl took {elapsed:.1f}s")
+    return problems
+
+
+# Runs the crawl scheduler backend against a local fake job board that rate limits and serves
+# captcha pages, and checks the jobs, the retries and stop(). Needs no network and no browser.
+if __name__ == "__main__":
+    server, base_url = serve_directory(FIXTURE_DIR, handler=FakeJobBoard)
+    problems = []
+    with tempfile.TemporaryDirectory() as state_dir:
+        # Keep this run's selector hit counts out of the real stats file
+        naukri_job.SELECTORS.path = os.path.join(state_dir, 'selector_stats.json')
+        try:
+            problems += check_crawl(base_url)
+            problems += check_stop(base_url)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    recaptcha_page = HttpResponse('', 200, {}, f"<html><head>{RECAPTCHA_SCRIPT}</head><body>Jobs</body></html>".encode())
+    if is_blocked(recaptcha_page):
+        problems.append("a page loading the reCAPTCHA script was treated as blocked")
+    if not is_blocked(HttpResponse('', 200, {}, CAPTCHA_PAGE)):
+        problems.append("a captcha page wasn't treated as blocked")
+
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if problems:
+        sys.exit(1)
+    print("All checks passed")
@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import naukri_job
+from http_fetch import HttpClient, serve_directory
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'naukri')
+
+# What the saved pages should give: (title, company, a few skills that must be matched)
+EXPECTED_JOBS = [
+    ('Data Engineer', 'Acme Analytics', {'Python', 'Spark', 'Kafka', 'Airflow', 'AWS'}),
+    ('Senior Data Engineer', 'Northwind Retail', {'Snowflake', 'dbt', 'SQL', 'Star Schema', 'Looker'}),
+    ('Data Engineer - Azure', 'Globex', {'Azure', 'Databricks', 'PySpark'}),
+    ('GCP Data Engineer', 'Initech', set()),
+    ('Big Data Engineer', 'Umbrella Systems', set()),
+]
+
+
+# Function to compare scraped jobs with EXPECTED_JOBS; returns a list of problems
+def check_jobs(jobs):
+    problems = []
+    if len(jobs) != len(EXPECTED_JOBS):
+        problems.append(f"expected {len(EXPECTED_JOBS)} jobs, got {len(jobs)}")
+    for job, (title, company, skills) in zip(jobs, EXPECTED_JOBS):
+        if (job.title, job.company) != (title, company):
+            problems.append(f"expected {title} at {company}, got {job.title} at {job.company}")
+        missing = skills - set(job.skills)
+        if missing:
+            problems.append(f"{title}: skills not matched: {', '.join(sorted(missing))}")
+    return problems
+
+
+# Runs the HTTP backend against the saved Naukri pages in fixtures/naukri, served locally,
+# and checks the jobs it extracts. Needs no network and no browser.
+if __name__ == "__main__":
+    server, base_url = serve_directory(FIXTURE_DIR)
+    client = HttpClient()
+    with tempfile.TemporaryDirectory() as state_dir:
+        # Keep this run's selector hit counts out of the real stats file
+        naukri_job.SELECTORS.path = os.path.join(state_dir, 'selector_stats.json')
+        try:
+            start = time.perf_counter()
+            jobs = naukri_job.scrape_naukri_jobs_http('data-engineer', 2, base_url=base_url)
+            elapsed = time.perf_counter() - start
+            problems = check_jobs(jobs)
+
+            # An app shell has no listings and too little text; it must be left to the browser
+            shell = client.get(f"{base_url}/app_shell.html")
+            if naukri_job.extract_http_page_jobs(shell) is not None:
+                problems.append("app shell page wasn't detected as needing a browser")
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+
+    print(f"\n{len(jobs)} jobs from 2 saved pages in {elapsed * 1000:.0f} ms")
+    for problem in problems:
+        print(f"FAILED: {problem}")
+    if problems:
+        sys.exit(1)
+    print("All checks passed")
@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_job
+import naukri_job
+import waits
+from metrics import METRICS
+from page_replay import DEFAULT_CORPUS_DIR, PAGES
+
+NAUKRI_KEYWORD = naukri_job.build_search_keyword('data engineer', 'india')
+LINKEDIN_KEYWORD = 'data%20engineer'
+
+# Sites the benchmark can record and replay
+SITES = ('naukri', 'linkedin')
+
+
+# Function to run one site's scraper the way its main block does, returning how many jobs it found
+def scrape(site, num_pages):
+    if site == 'naukri':
+        return len(naukri_job.scrape_naukri_jobs(NAUKRI_KEYWORD, num_pages))
+    return len(data_job.scrape_linkedin_jobs(LINKEDIN_KEYWORD, num_pages))
+
+
+# Function to keep replays from touching the scrapers' real state: selector hit counts and the
+# learned pagination strategy go to a temp dir. The recorded LinkedIn listing already holds every
+# card, so scrolling can't load more; the scroll wait gives up at once instead of waiting 5 s.
+@contextmanager
+def replay_state():
+    saved = (naukri_job.SELECTORS.path, naukri_job.PAGINATION_PATH, waits.STEP_TIMEOUTS['scroll'])
+    with tempfile.TemporaryDirectory() as state_dir:
+        naukri_job.SELECTORS.path = os.path.join(state_dir, 'selector_stats.json')
+        naukri_job.PAGINATION_PATH = os.path.join(state_dir, 'pagination.json')
+        waits.STEP_TIMEOUTS['scroll'] = 0
+        try:
+            yield
+        finally:
+            naukri_job.SELECTORS.path, naukri_job.PAGINATION_PATH, waits.STEP_TIMEOUTS['scroll'] = saved
+
+
+# Function to record a site's pages from the live site into the corpus
+def record(site, num_pages, corpus):
+    PAGES.record(corpus)
+    try:
+        jobs = scrape(site, num_pages)
+    finally:
+        PAGES.stop()
+    print(f"Recorded {jobs} {site} jobs")
+
+
+# Function to replay a site's recorded pages once, returning its measurements.
+# Stage times come from the scrapers' own METRICS timers and waits. They are inclusive
+# (extract_page contains extract_skills), and stages run in worker threads (LinkedIn
+# detail pages) add up across threads, so they can exceed wall time.
+def replay_once(site, num_pages):
+    METRICS.configure('full')
+    METRICS.reset()
+    PAGES.round_trips = 0
+    PAGES.corpus.served.clear()
+    PAGES.corpus.missing.clear()
+    start = time.perf_counter()
+    jobs = scrape(site, num_pages)
+    elapsed = time.perf_counter() - start
+    return {
+        'seconds': elapsed,
+        'jobs': jobs,
+        'pages': sum(PAGES.corpus.served.values()),
+        'missing': sum(PAGES.corpus.missing.values()),
+        'round_trips': PAGES.round_trips,
+        'stages': METRICS.report()['stages'],
+    }
+
+
+# Function to print one replay's measurements
+def report(site, run, result):
+    seconds = result['seconds']
+    print(f"\n{site} run {run}: {seconds:.1f}s, {result['pages']} pages ({result['pages'] / seconds:.2f}/s), "
+          f"{result['jobs']} jobs ({result['jobs'] / seconds:.2f}/s), {result['round_trips']} WebDriver round trips")
+    if result['missing']:
+        print(f"  WARNING: {result['missing']} requests weren't in the corpus; re-record to compare fairly")
+    print(f"  {'stage':<22} {'calls':>6} {'seconds':>9} {'share':>7}")
+    for stage in sorted(result['stages'], key=lambda stage: -stage['seconds']):
+        name = ':'.join([stage['name']] + list(stage['labels'].values()))
+        print(f"  {name:<22} {stage['calls']:>6} {stage['seconds']:>9.2f} {stage['seconds'] / seconds:>7.1%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record scraper pages, or benchmark the scrapers against recordings")
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('--site', choices=SITES, nargs='+', default=['naukri'])
+    parser.add_argument('--pages', type=int, default=3, help="results pages (Naukri) or scrolls (LinkedIn)")
+    parser.add_argument('--repeat', type=int, default=3, help="replays per site")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS_DIR)
+    args = parser.parse_args()
+
+    if args.mode == 'record':
+        for site in args.site:
+            record(site, args.pages, args.corpus)
+    else:
+        PAGES.replay(args.corpus)
+        try:
+            with replay_state():
+                for site in args.site:
+                    for run in range(1, args.repeat + 1):
+                        report(site, run, replay_once(site, args.pages))
+        finally:
+            PAGES.stop()
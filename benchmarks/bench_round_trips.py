@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium.webdriver.common.by import By
+
+from naukri_job import JOB_SELECTORS, create_driver, extract_job_info, extract_jobs_batch
+
+JOB_TUPLE_HTML = '''
+<div class="srp-jobtuple-wrapper">
+  <a class="title" href="https://www.naukri.com/job-listings-data-engineer-{n}">Data Engineer {n}</a>
+  <a class="comp-name companyName">Company {n}</a>
+  <span class="job-desc">Build pipelines with Python, Spark, Kafka and Airflow on AWS.</span>
+  <ul class="tags-gt"><li>python</li><li>spark</li><li>sql</li></ul>
+</div>
+'''
+
+
+# Function to write a synthetic results page with the given number of job tuples
+def write_fixture(directory, jobs_per_page):
+    path = os.path.join(directory, 'results.html')
+    with open(path, 'w') as f:
+        f.write('<html><body>')
+        f.write(''.join(JOB_TUPLE_HTML.format(n=n) for n in range(jobs_per_page)))
+        f.write('</body></html>')
+    return 'file://' + path
+
+
+# Function to count WebDriver commands; every command is one HTTP round trip to chromedriver
+def count_round_trips(driver):
+    counter = {'calls': 0}
+    execute = driver.execute
+
+    def counting_execute(*args, **kwargs):
+        counter['calls'] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counting_execute
+    return counter
+
+
+# The per-element path extract_page_jobs used before batch extraction
+def per_element_extract(driver):
+    for selector in JOB_SELECTORS:
+        job_elements = driver.find_elements(By.XPATH, selector)
+        if job_elements:
+            return [job for job in map(extract_job_info, job_elements) if job]
+    return []
+
+
+# Function to measure round trips and wall time for one extraction path
+def measure(driver, counter, extract):
+    counter['calls'] = 0
+    start = time.perf_counter()
+    jobs = extract(driver)
+    return len(jobs), counter['calls'], time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    jobs_per_page = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = write_fixture(directory, jobs_per_page)
+        driver = create_driver(headless=True)
+        try:
+            driver.get(url)
+            counter = count_round_trips(driver)
+            for name, extract in [('per-element', per_element_extract), ('batch script', extract_jobs_batch)]:
+                jobs, calls, seconds = measure(driver, counter, extract)
+                print(f"{name:>12}: {jobs} jobs, {calls} round trips, {seconds * 1000:.0f} ms per page")
+        finally:
+            driver.quit()
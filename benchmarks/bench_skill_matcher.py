@@ -0,0 +1,67 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skill_matcher import SKILL_CATEGORIES, match_skills
+
+FILLER_WORDS = [
+    'experience', 'with', 'building', 'scalable', 'pipelines', 'team', 'maintain',
+    'digital', 'platform', 'design', 'strong', 'knowledge', 'of', 'and', 'years',
+    'working', 'on', 'cloud', 'data', 'engineer', 'develop', 'good', 'communication',
+]
+
+
+# Function to build a synthetic corpus of job descriptions
+def make_corpus(size, seed=42):
+    rng = random.Random(seed)
+    skills = [skill for category_skills in SKILL_CATEGORIES.values() for skill in category_skills]
+    corpus = []
+    for _ in range(size):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(60, 160))
+        for skill in rng.sample(skills, rng.randint(3, 12)):
+            words.insert(rng.randrange(len(words)), skill)
+        corpus.append(' '.join(words))
+    return corpus
+
+
+# The per-skill substring loop that extract_skills used before the compiled matcher
+def legacy_extract_skills(text):
+    skills_with_categories = []
+    for category, category_skills in SKILL_CATEGORIES.items():
+        for skill in category_skills:
+            skills_with_categories.append((skill, category))
+
+    text = text.lower()
+    found_skills = []
+    for skill, category in skills_with_categories:
+        if skill.lower() in text:
+            found_skills.append((skill, category))
+    return [skill for skill, _ in found_skills], found_skills
+
+
+# Function to time one extractor over the whole corpus
+def run(extract, corpus):
+    start = time.perf_counter()
+    hits = 0
+    for description in corpus:
+        hits += len(extract(description)[1])
+    return time.perf_counter() - start, hits
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"Building synthetic corpus of {size} descriptions...")
+    corpus = make_corpus(size)
+
+    legacy_time, legacy_hits = run(legacy_extract_skills, corpus)
+    compiled_time, compiled_hits = run(match_skills, corpus)
+
+    print(f"Substring loop:   {legacy_time:.2f}s ({size / legacy_time:,.0f} descriptions/s, {legacy_hits} matches)")
+    print(f"Compiled matcher: {compiled_time:.2f}s ({size / compiled_time:,.0f} descriptions/s, {compiled_hits} matches)")
+    print(f"Speedup: {legacy_time / compiled_time:.1f}x")
+    # The compiled matcher enforces word boundaries and folds aliases into one
+    # canonical skill, so it reports fewer false or double-counted hits
+    print(f"Substring-only false positives dropped: {legacy_hits - compiled_hits}")
@@ -0,0 +1,98 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_record import JobRecord
+from naukri_job import TITLE_PATTERNS, compile_title_matcher, extract_jobs_from_text, iter_text_segments
+
+FILLER = ['Posted 3 days ago', 'Bengaluru, Hyderabad', '3-6 Yrs', 'Not disclosed', 'Python, SQL, Spark, AWS',
+          'Build and maintain ETL pipelines on Airflow and dbt', 'Work with Kafka streams and Snowflake',
+          'Hiring for a product company', 'Save', 'Apply on company site']
+TITLES = ['Senior Data Engineer', 'Data Scientist - NLP', 'Analytics Engineer', 'Lead DATA ENGINEER (Azure)']
+
+
+# The fallback parser as it was before the single-pass rewrite.
+# make_record builds each job; pass a plain tuple to time the segmenting alone.
+def legacy_extract_jobs_from_text(page_text, make_record=JobRecord.from_description):
+    job_info = []
+    lines = page_text.split('\n')
+    job_title = None
+    company_name = None
+    job_description = ""
+    collecting_description = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if any(keyword in line.lower() for keyword in ['data engineer', 'data scientist', 'analytics engineer']):
+            if job_title and collecting_description:
+                job_info.append(make_record(
+                    job_title, company_name if company_name else "Unknown", job_description))
+            job_title = line
+            company_name = None
+            job_description = line + " "
+            collecting_description = True
+        elif collecting_description:
+            if not company_name and len(line) < 50:
+                company_name = line
+            job_description += line + " "
+
+    if job_title and collecting_description:
+        job_info.append(make_record(
+            job_title, company_name if company_name else "Unknown", job_description))
+    return job_info
+
+
+# Function to segment a page with the rewrite, without matching skills
+def segment(page_text):
+    return list(iter_text_segments(page_text, compile_title_matcher(tuple(TITLE_PATTERNS))))
+
+
+# Function to segment a page with the legacy parser, without matching skills
+def legacy_segment(page_text):
+    return legacy_extract_jobs_from_text(page_text, make_record=lambda *fields: fields)
+
+
+# Function to build a fallback page's body text with `num_jobs` listings,
+# `lines_per_job` lines each, plus some navigation text before the first one
+def make_page(num_jobs, lines_per_job, seed=7):
+    rng = random.Random(seed)
+    lines = ['Jobs', 'Login', 'Register', '', '  Filters  ']
+    for i in range(num_jobs):
+        lines.append(f"  {rng.choice(TITLES)} {i}")
+        lines.append(f"Company {i} Pvt Ltd")
+        lines.extend(rng.choice(FILLER + ['']) for _ in range(lines_per_job))
+    return '\n'.join(lines)
+
+
+# Function to time one parse, best of `repeat` runs
+def timed(parse, page_text, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        jobs = parse(page_text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return jobs, best
+
+
+if __name__ == "__main__":
+    # Segmenting is the part that was rewritten; the full parse also matches skills in every job
+    print(f"{'jobs':>6} {'lines/job':>9} {'page KB':>8} {'segment':>9} {'legacy':>9} {'MB/s':>7} "
+          f"{'full parse':>11} {'legacy':>9}  identical")
+    for num_jobs, lines_per_job in [(20, 10), (200, 10), (20, 2000), (2000, 20)]:
+        page_text = make_page(num_jobs, lines_per_job)
+        segments, segment_time = timed(segment, page_text)
+        legacy_segments, legacy_segment_time = timed(legacy_segment, page_text)
+        jobs, parse_time = timed(extract_jobs_from_text, page_text)
+        legacy_jobs, legacy_parse_time = timed(legacy_extract_jobs_from_text, page_text)
+        identical = ([job.to_dict() for job in jobs] == [job.to_dict() for job in legacy_jobs]
+                     and [(title, company or "Unknown", description) for title, company, description in segments]
+                     == legacy_segments)
+        size = len(page_text.encode('utf-8'))
+        print(f"{num_jobs:>6} {lines_per_job:>9} {size / 1024:>8.0f} {segment_time:>8.3f}s {legacy_segment_time:>8.3f}s "
+              f"{size / segment_time / 1e6:>7.1f} {parse_time:>10.3f}s {legacy_parse_time:>8.3f}s  {identical}")
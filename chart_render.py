@@ -0,0 +1,90 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+# Charts are only ever written to files, so skip the GUI backend and its event loop
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from metrics import METRICS
+from output_manifest import hash_data
+
+# Bump when the drawing code changes, so charts rendered by older code count as stale
+RENDER_VERSION = 1
+
+# Below this many charts, starting worker processes costs more than it saves
+MIN_CHARTS_FOR_POOL = 4
+
+
+# Function to describe a horizontal bar chart with a count label on every bar
+def bar_chart_spec(path, labels, values, title, xlabel, ylabel, color, figsize=(12, 8)):
+    return {'kind': 'barh', 'path': path, 'labels': list(labels), 'values': list(values),
+            'title': title, 'xlabel': xlabel, 'ylabel': ylabel, 'color': color, 'figsize': figsize}
+
+
+# Function to describe a pie chart with percentage labels and every slice pulled out by `explode`
+def pie_chart_spec(path, labels, values, title, explode, figsize=(12, 10)):
+    return {'kind': 'pie', 'path': path, 'labels': list(labels), 'values': list(values),
+            'title': title, 'explode': explode, 'figsize': figsize}
+
+
+# Function to draw one chart spec and save it; the figure is closed as soon as it is saved
+def render_chart(spec):
+    fig = plt.figure(figsize=spec['figsize'])
+    try:
+        if spec['kind'] == 'barh':
+            bars = plt.barh(spec['labels'], spec['values'], color=spec['color'])
+            plt.xlabel(spec['xlabel'])
+            plt.ylabel(spec['ylabel'])
+            plt.title(spec['title'])
+
+            # Add count labels to the bars
+            for bar in bars:
+                width = bar.get_width()
+                plt.text(width + 0.3, bar.get_y() + bar.get_height()/2, f'{width:.0f}',
+                         ha='left', va='center')
+
+            plt.tight_layout()
+        else:
+            plt.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%',
+                    startangle=90, shadow=True, explode=[spec['explode']]*len(spec['values']))
+            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+            plt.title(spec['title'])
+
+        plt.savefig(spec['path'])
+    finally:
+        plt.close(fig)
+    return spec['path']
+
+
+# Function to hash everything a chart is drawn from
+def spec_hash(spec):
+    return hash_data({'version': RENDER_VERSION, 'spec': spec})
+
+
+# Function to render many chart specs, spread over a pool of worker processes.
+# Specs are plain data (labels, values, titles), so each worker draws from the
+# pre-aggregated numbers without needing the aggregator or any DataFrames.
+# With an OutputManifest, charts whose spec hasn't changed since they were
+# last written are skipped. Returns the paths of the charts actually rendered.
+def render_charts(specs, processes=None, manifest=None):
+    hashes = [spec_hash(spec) for spec in specs]
+    stale = [(spec, data_hash) for spec, data_hash in zip(specs, hashes)
+             if manifest is None or not manifest.is_current(spec['path'], data_hash)]
+    if manifest is not None and len(stale) < len(specs):
+        print(f"{len(specs) - len(stale)} of {len(specs)} charts unchanged, not re-rendering them")
+
+    for spec, _ in stale:
+        os.makedirs(os.path.dirname(spec['path']) or '.', exist_ok=True)
+    if processes == 1 or len(stale) < MIN_CHARTS_FOR_POOL:
+        paths = [render_chart(spec) for spec, _ in stale]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            paths = list(executor.map(render_chart, [spec for spec, _ in stale]))
+
+    if manifest is not None:
+        for spec, data_hash in stale:
+            manifest.record(spec['path'], data_hash)
+    METRICS.count('charts_rendered', len(paths))
+    METRICS.count('charts_unchanged', len(specs) - len(stale))
+    return paths
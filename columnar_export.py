@@ -0,0 +1,132 @@
+import os
+
+# pyarrow is optional; only the columnar export needs it
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DEFAULT_EXPORT_DIR = 'skill_analysis/export'
+
+JOBS_FILE = 'jobs'
+MATCHES_FILE = 'job_skills'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("The columnar export needs pyarrow: pip install pyarrow")
+
+
+def _jobs_schema():
+    return pa.schema([
+        ('job_id', pa.string()),
+        ('title', pa.string()),
+        ('company', pa.string()),
+        ('link', pa.string()),
+        ('description', pa.string()),
+        ('tags', pa.list_(pa.string())),
+        ('skill_count', pa.int32()),
+    ])
+
+
+# One row per (job, skill, category) match. Skills and categories repeat a
+# lot, so Parquet gets them dictionary-encoded; Arrow IPC files can't change
+# a dictionary between batches, so there they stay plain strings.
+def _matches_schema(dictionary=True):
+    label = pa.dictionary(pa.int32(), pa.string()) if dictionary else pa.string()
+    return pa.schema([
+        ('job_id', pa.string()),
+        ('skill', label),
+        ('category', label),
+    ])
+
+
+# Writes job records and their skill matches to columnar files as a crawl runs.
+#
+# Two files are written to `directory`: jobs.<ext> with one row per job, and
+# job_skills.<ext>, a sparse job x skill table with one row per match, which
+# joins back to jobs on job_id. Rows are buffered and written every
+# `batch_size` jobs, so each batch becomes one Parquet row group (or Arrow
+# record batch) and the crawl never holds more than a batch in memory.
+# fmt is 'parquet', or 'arrow' for Arrow IPC files that can be memory-mapped.
+class ColumnarWriter:
+    def __init__(self, directory=DEFAULT_EXPORT_DIR, batch_size=1000, fmt='parquet'):
+        _require_pyarrow()
+        if fmt not in ('parquet', 'arrow'):
+            raise ValueError(f"Unknown columnar format {fmt!r}, expected 'parquet' or 'arrow'")
+        os.makedirs(directory, exist_ok=True)
+        self.batch_size = batch_size
+        self.fmt = fmt
+        self.jobs_path = os.path.join(directory, f"{JOBS_FILE}.{fmt}")
+        self.matches_path = os.path.join(directory, f"{MATCHES_FILE}.{fmt}")
+        self.jobs_written = 0
+        self._matches_schema = _matches_schema(dictionary=fmt == 'parquet')
+        self._jobs_writer = self._open(self.jobs_path, _jobs_schema())
+        self._matches_writer = self._open(self.matches_path, self._matches_schema)
+        self._jobs = []
+        self._matches = []
+
+    def _open(self, path, schema):
+        if self.fmt == 'parquet':
+            return pq.ParquetWriter(path, schema, compression='zstd')
+        return ipc.new_file(path, schema)
+
+    def _write(self, writer, rows, schema):
+        table = pa.Table.from_pylist(rows, schema=schema)
+        if self.fmt == 'parquet':
+            writer.write_table(table)
+        else:
+            writer.write_table(table, max_chunksize=len(rows))
+
+    # Function to add one job and its matches, writing a batch once `batch_size` jobs are buffered
+    def add(self, job):
+        job_id = job.key()
+        self._jobs.append({
+            'job_id': job_id,
+            'title': job.title,
+            'company': job.company,
+            'link': job.link,
+            'description': job.description,
+            'tags': job.tags,
+            'skill_count': len(job.skills),
+        })
+        self._matches.extend({'job_id': job_id, 'skill': skill, 'category': category}
+                             for skill, category in job.skill_categories)
+        if len(self._jobs) >= self.batch_size:
+            self.flush()
+
+    # Function to write whatever is buffered as one batch
+    def flush(self):
+        if not self._jobs:
+            return
+        self._write(self._jobs_writer, self._jobs, _jobs_schema())
+        if self._matches:
+            self._write(self._matches_writer, self._matches, self._matches_schema)
+        self.jobs_written += len(self._jobs)
+        self._jobs = []
+        self._matches = []
+
+    # Function to write the last batch and finish both files
+    def close(self):
+        self.flush()
+        self._jobs_writer.close()
+        self._matches_writer.close()
+        print(f"Exported {self.jobs_written} jobs to: {self.jobs_path} and {self.matches_path}")
+
+
+# Function to read an exported table, memory-mapped, optionally keeping only rows
+# where each given column equals the given value, e.g. read_table(path, skill='Spark')
+def read_table(path, **equals):
+    _require_pyarrow()
+    if path.endswith('.parquet'):
+        filters = [(column, '=', value) for column, value in equals.items()] or None
+        return pq.read_table(path, filters=filters, memory_map=True)
+
+    # Zero-copy: the table's buffers point into the mapped file
+    table = ipc.open_file(pa.memory_map(path)).read_all()
+    for column, value in equals.items():
+        table = table.filter(pc.equal(table[column], value))
+    return table
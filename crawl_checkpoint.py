@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from job_record import JobRecord
+
+DEFAULT_CHECKPOINT_PATH = 'skill_analysis/crawl_checkpoint.json'
+
+
+# Crawl progress saved to disk so a long pagination run can be resumed.
+#
+# The checkpoint holds the pages completed so far, the last completed page
+# URL and the jobs collected from them. It is written every `every` pages
+# (and whenever the crawl stops early) via a temp file + rename, so a crash
+# mid-write never leaves a corrupt checkpoint. A checkpoint only resumes a
+# crawl for the same keyword. With keep_jobs=False only the page cursor is
+# saved, for crawls whose jobs are already persisted in a JobStore.
+class CrawlCheckpoint:
+    def __init__(self, keyword, path=DEFAULT_CHECKPOINT_PATH, every=5, keep_jobs=True):
+        self.keyword = keyword
+        self.path = path
+        self.every = every
+        self.keep_jobs = keep_jobs
+        self.completed_pages = set()
+        self.last_page = 0
+        self.last_url = None
+        self.jobs = []
+        self._pages_since_save = 0
+        self._lock = threading.Lock()
+
+    # Function to load a saved checkpoint; returns True if there was one for this keyword
+    def load(self):
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('keyword') != self.keyword:
+            print(f"Checkpoint in {self.path} is for a different search, ignoring it")
+            return False
+
+        self.completed_pages = set(state['completed_pages'])
+        self.last_page = state['last_page']
+        self.last_url = state['last_url']
+        self.jobs = [JobRecord.from_dict(job) for job in state['jobs']]
+        print(f"Resuming from checkpoint: {len(self.completed_pages)} pages and {len(self.jobs)} jobs "
+              f"already collected, last page {self.last_page} ({self.last_url})")
+        return True
+
+    # Function to record a finished page, saving the checkpoint every `every` pages
+    def page_done(self, page, url, page_jobs):
+        with self._lock:
+            self.completed_pages.add(page)
+            if self.keep_jobs:
+                self.jobs.extend(page_jobs)
+            if page >= self.last_page:
+                self.last_page, self.last_url = page, url
+            self._pages_since_save += 1
+            due = self._pages_since_save >= self.every
+        if due:
+            self.save()
+
+    # Function to tell whether a page was already scraped before a resume
+    def is_done(self, page):
+        return page in self.completed_pages
+
+    # Function to get the first page that hasn't been scraped yet
+    def next_page(self):
+        page = 1
+        while page in self.completed_pages:
+            page += 1
+        return page
+
+    # Function to write the checkpoint atomically
+    def save(self):
+        with self._lock:
+            state = {
+                'keyword': self.keyword,
+                'saved_at': datetime.now().isoformat(timespec='seconds'),
+                'completed_pages': sorted(self.completed_pages),
+                'last_page': self.last_page,
+                'last_url': self.last_url,
+                'jobs': [job.to_dict() for job in self.jobs],
+            }
+            self._pages_since_save = 0
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.path)
+        print(f"Checkpoint saved: {len(state['completed_pages'])} pages, {len(state['jobs'])} jobs")
+
+    # Function to delete the checkpoint once the crawl has finished
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,251 @@
+import asyncio
+import itertools
+import random
+import time
+from urllib.parse import urlsplit
+
+from html_extract import parse_html
+from metrics import METRICS
+
+# Request priorities: lower runs first, so listing pages are fetched before the detail pages they lead to
+LISTING = 0
+DETAIL = 1
+
+# Phrases in a page's visible text that mean the site served a bot check instead of the page.
+# Scripts aren't searched: normal pages load reCAPTCHA for their login and apply forms.
+CAPTCHA_MARKERS = ('captcha', 'are you a robot', 'unusual traffic', 'access denied')
+
+# Status codes that mean "slow down" rather than "this page is broken"
+BLOCK_STATUSES = {403, 429, 503}
+
+
+# A token-bucket rate limiter: `rate` requests per second on average, bursts of up to `capacity`
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    # Function to wait until a token is available and take it
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    # Function to halve the rate after the host pushed back
+    def slow_down(self, min_rate=0.05):
+        self.rate = max(min_rate, self.rate / 2)
+
+    # Function to creep back towards the configured rate after a success
+    def recover(self):
+        self.rate = min(self.max_rate, self.rate * 1.1)
+
+
+# One URL waiting to be fetched
+class CrawlRequest:
+    def __init__(self, url, kind, priority, meta=None, attempt=0):
+        self.url = url
+        self.kind = kind
+        self.priority = priority
+        self.meta = meta or {}
+        self.attempt = attempt
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+
+# Function to tell whether a response is a block or bot check rather than real content
+def is_blocked(response):
+    if response.status in BLOCK_STATUSES:
+        return True
+    head = response.body[:20000].decode('utf-8', errors='ignore')
+    text = parse_html(head).text().lower()
+    return any(marker in text for marker in CAPTCHA_MARKERS)
+
+
+# An asyncio crawl scheduler.
+#
+# Requests wait in a priority queue (listing pages before detail pages) and
+# are fetched by at most `max_in_flight` workers at once. Every host has its
+# own token bucket, so one slow site doesn't hold up another. A 403/429/503 or
+# a captcha page backs off exponentially (honouring Retry-After), halves that
+# host's rate, and requeues the request, up to `max_retries` times.
+# Requests that never get fetched, because they ran out of retries or
+# the crawl was stopped while they waited, end up in `failed`.
+#
+# `handlers` maps a request kind to a function(response, request, scheduler)
+# that returns an iterable of results and may call scheduler.add() for
+# follow-up pages; the existing extract functions run as these stages.
+# Fetching goes through an HttpClient in worker threads.
+class CrawlScheduler:
+    def __init__(self, client, handlers, max_in_flight=8, rate_per_host=1.0, burst=2,
+                 max_retries=4, backoff_base=2.0, max_backoff=120.0):
+        self.client = client
+        self.handlers = handlers
+        self.max_in_flight = max_in_flight
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.results = []
+        self.failed = []
+        self.stats = {'fetched': 0, 'retries': 0, 'blocked': 0, 'failed': 0, 'dropped': 0}
+        self._pending = []
+        self._buckets = {}
+        self._order = itertools.count()
+        self._queue = None
+        self._loop = None
+        self._stopped = False
+        self._retry_tasks = set()
+
+    # Function to queue a URL; can be called before run() or from a handler
+    def add(self, url, kind, priority=None, meta=None, attempt=0):
+        if priority is None:
+            priority = LISTING if kind == 'listing' else DETAIL
+        request = CrawlRequest(url, kind, priority, meta, attempt)
+        if self._queue is None:
+            self._pending.append(request)
+        else:
+            self._queue.put_nowait((request.priority, next(self._order), request))
+
+    # Function to stop the crawl: in-flight requests finish, queued ones and those
+    # waiting to be retried are moved to `failed`. Safe to call from another thread.
+    def stop(self):
+        self._stopped = True
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancel_retries)
+            except RuntimeError:
+                # The crawl finished and its loop closed in the meantime
+                pass
+
+    def _cancel_retries(self):
+        for task in list(self._retry_tasks):
+            task.cancel()
+
+    def _drop(self, request):
+        self.stats['dropped'] += 1
+        self.failed.append(request)
+
+    def _bucket(self, host):
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate_per_host, self.burst)
+        return self._buckets[host]
+
+    # Function to work out how long to wait before retrying a blocked request
+    def _backoff(self, request, response):
+        retry_after = response.headers.get('retry-after', '') if response is not None else ''
+        if retry_after.isdigit():
+            return min(self.max_backoff, float(retry_after))
+        delay = self.backoff_base * 2 ** request.attempt
+        return min(self.max_backoff, delay * random.uniform(0.5, 1.5))
+
+    async def _retry_later(self, request, delay):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self._stopped = True
+        try:
+            if self._stopped:
+                self._drop(request)
+            else:
+                self.add(request.url, request.kind, request.priority, request.meta, request.attempt + 1)
+        finally:
+            # The retry is queued (or dropped), so the original request can now count as done
+            self._queue.task_done()
+
+    # Function to fetch one request and hand the response to its stage.
+    # Returns True when the request is finished, False when a retry was scheduled.
+    async def _process(self, request):
+        if self._stopped:
+            self._drop(request)
+            return True
+        bucket = self._bucket(request.host)
+        await bucket.acquire()
+
+        response = None
+        start = time.perf_counter()
+        try:
+            response = await asyncio.to_thread(self.client.get, request.url)
+            METRICS.observe('page_load_seconds', time.perf_counter() - start, via='http')
+            blocked = is_blocked(response)
+        except Exception as e:
+            print(f"Error fetching {request.url}: {str(e)}")
+            blocked = False
+            error = True
+        else:
+            error = False
+
+        if blocked or error:
+            if blocked:
+                self.stats['blocked'] += 1
+                bucket.slow_down()
+            if request.attempt < self.max_retries:
+                delay = self._backoff(request, response)
+                if not blocked:
+                    reason = "Error"
+                elif response.status in BLOCK_STATUSES:
+                    reason = f"HTTP {response.status}"
+                else:
+                    reason = "Captcha page"
+                print(f"{reason} from {request.host}, retrying {request.url} in {delay:.0f}s")
+                self.stats['retries'] += 1
+                METRICS.count('retries', reason='blocked' if blocked else 'error')
+                task = asyncio.create_task(self._retry_later(request, delay))
+                self._retry_tasks.add(task)
+                task.add_done_callback(self._retry_tasks.discard)
+                return False
+            self.stats['failed'] += 1
+            self.failed.append(request)
+            return True
+
+        self.stats['fetched'] += 1
+        bucket.recover()
+        try:
+            self.results.extend(self.handlers[request.kind](response, request, self) or [])
+        except Exception as e:
+            print(f"Error handling {request.kind} page {request.url}: {str(e)}")
+            self.failed.append(request)
+        return True
+
+    async def _worker(self):
+        while True:
+            _, _, request = await self._queue.get()
+            finished = True
+            try:
+                finished = await self._process(request)
+            finally:
+                if finished:
+                    self._queue.task_done()
+
+    # Function to crawl until every queued request (and every follow-up) is done
+    async def run(self):
+        self._queue = asyncio.PriorityQueue()
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        for request in self._pending:
+            self._queue.put_nowait((request.priority, next(self._order), request))
+        self._pending = []
+
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.max_in_flight)]
+        try:
+            await self._queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._queue = None
+            self._loop = None
+        return self.results
@@ -1,75 +1,162 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from collections import Counter
-
-# Function to scrape LinkedIn job postings and extract skills
-def scrape_linkedin_jobs(keyword, num_pages):
-    job_skills = []
-
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+from driver_pool import DriverPool
+from job_record import JobRecord
+from job_store import JobStore
+from html_extract import looks_js_only, parse_html
+from http_fetch import HttpClient
+from skill_matcher import match_skills
+from page_replay import PAGES
+from metrics import METRICS
+from waits import attribute_equals, element_count_above, print_wait_summary, wait_until
+
+# Browsers used for job-detail pages, and how many pages each one loads before it is recycled
+DETAIL_WORKERS = 3
+RECYCLE_AFTER = 25
+
+# Function to start a headless Chrome WebDriver
+@METRICS.timed('start_browser')
+def create_driver():
     # Set up options for the Chrome WebDriver
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')  # Run Chrome in headless mode (optional)
     options.add_argument("--no-sandbox")
 
-    # Start a Selenium WebDriver with options
-    driver = webdriver.Chrome(options=options)
-
-
-    url = f'https://www.linkedin.com/jobs/search/?keywords={keyword}'
-    driver.get(url)
-    j = 0
-    # Scroll to load more jobs (you may need to adjust the number of scrolls)
-    for _ in range(num_pages):
-        print("scroll ######",j)
-        j = j+1
-        driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
-        time.sleep(2)  # Wait for content to load
-
-    # Extract job titles and skills (modify as needed)
-    job_cards = driver.find_elements(By.CSS_SELECTOR, '.base-card')
-    break_element = 0
-    for card in job_cards:
-        try:
-
-            job_title_element = WebDriverWait(card, 10)\
-            .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-search-card__title')))
-            company_element = WebDriverWait(card, 10)\
-            .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-search-card__subtitle')))
-            description = WebDriverWait(card, 10)\
-            .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-card__full-link')))
-
-
-            company_name = company_element.text
-            job_title = job_title_element.text
-            print(job_title, " ", company_name)
-            job_link = description.get_attribute('href')
-            print(job_link)
-
-            #Hitting each job's URL to get more information
-            job_driver = webdriver.Chrome(options=options)
-            job_driver.get(job_link)
-
-            #expand descriptions by clicking on show more
-            expand_description(job_driver)
-            #extract description element
-            job_description = extract_job_description(job_driver)
-            #extract skills from description
-            extracted_skills = extract_skills(job_description)
-            job_skills.append(extracted_skills)
-            job_driver.quit()
-
-        except Exception as e:
-            print("Job details not found for this card.")
-            continue
-
-    # Close the WebDriver when done
-    driver.quit()
+    # Start a Selenium WebDriver with options; page recording/replay hooks in when enabled
+    return PAGES.wrap_driver(webdriver.Chrome(options=options))
+
+# Function to read title, company and link from a job card on the listing page
+@METRICS.timed('read_card', fine=True)
+def read_job_card(card):
+    job_title_element = WebDriverWait(card, 10)\
+    .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-search-card__title')))
+    company_element = WebDriverWait(card, 10)\
+    .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-search-card__subtitle')))
+    description = WebDriverWait(card, 10)\
+    .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.base-card__full-link')))
+
+    return job_title_element.text, company_element.text, description.get_attribute('href')
+
+# Function to open a job's page in a pooled browser and extract its description
+@METRICS.timed('fetch_details')
+def fetch_job_description(pool, job_link):
+    with pool.session() as job_driver:
+        job_driver.get(job_link)
+
+        #expand descriptions by clicking on show more
+        expand_description(job_driver)
+        # Save the expanded page when recording a fixture corpus (no-op otherwise)
+        PAGES.capture(job_driver, 'detail')
+        #extract description element
+        return extract_job_description(job_driver)
+
+# Function to fetch a job's page over plain HTTP and extract its description.
+# LinkedIn's public job pages are server-rendered, so the browser is only
+# used when the description isn't in the HTML.
+def fetch_job_description_http(client, pool, job_link):
+    try:
+        response = client.get(job_link)
+        document = parse_html(response.text)
+        descriptions = document.by_class('description')
+        if response.status == 200 and descriptions and not looks_js_only(document):
+            PAGES.capture_html(response.url, response.text, 'detail')
+            return descriptions[0].text()
+    except Exception as e:
+        print(f"HTTP fetch failed for {job_link}: {str(e)}")
+    return fetch_job_description(pool, job_link)
+
+# Function to fetch a job's details and match its skills
+def fetch_job(fetch_description, job_title, company_name, job_link):
+    job_description = fetch_description(job_link)
+    job = JobRecord.from_description(job_title, company_name, job_description, link=job_link)
+    print(job.skills)
+    return job
+
+# Function to scrape LinkedIn job postings and extract skills.
+# Job-detail pages are fetched by a small pool of reused browsers while the
+# listing browser keeps scrolling, instead of starting a new Chrome per card.
+# detail_backend picks how detail pages are loaded: 'browser' or 'http'.
+# With a JobStore, cards already in the store reuse their stored skills instead of
+# fetching the detail page again, and every fetched job is saved.
+def scrape_linkedin_jobs(keyword, num_pages, num_detail_workers=DETAIL_WORKERS, recycle_after=RECYCLE_AFTER,
+                         detail_backend='browser', store=None):
+    driver = create_driver()
+    pool = DriverPool(create_driver, num_detail_workers, max_uses=recycle_after)
+    client = HttpClient(connections_per_host=num_detail_workers)
+    executor = ThreadPoolExecutor(max_workers=num_detail_workers)
+    if detail_backend == 'http':
+        fetch_description = partial(fetch_job_description_http, client, pool)
+    else:
+        fetch_description = partial(fetch_job_description, pool)
+    detail_fetches = []
+    cards_read = 0
+    job_skills = []
+
+    # Function to queue detail fetches for cards that appeared since the last call
+    def queue_new_cards():
+        nonlocal cards_read
+        job_cards = driver.find_elements(By.CSS_SELECTOR, '.base-card')
+        for card in job_cards[cards_read:]:
+            try:
+                job_title, company_name, job_link = read_job_card(card)
+                print(job_title, " ", company_name)
+                print(job_link)
+                known_job = store.get(JobRecord(job_title, company_name, link=job_link).key()) if store else None
+                if known_job:
+                    print("Already stored, skipping detail page")
+                    detail_fetches.append(known_job)
+                    continue
+                #Hitting each job's URL to get more information
+                detail_fetches.append(executor.submit(fetch_job, fetch_description, job_title, company_name, job_link))
+            except Exception as e:
+                print("Job details not found for this card.")
+        cards_read = len(job_cards)
+
+    try:
+        url = f'https://www.linkedin.com/jobs/search/?keywords={keyword}'
+        driver.get(url)
+        queue_new_cards()
+        j = 0
+        # Scroll to load more jobs (you may need to adjust the number of scrolls)
+        for _ in range(num_pages):
+            print("scroll ######",j)
+            j = j+1
+            card_count = len(driver.find_elements(By.CSS_SELECTOR, '.base-card'))
+            driver.find_element(By.TAG_NAME, 'body').send_keys(Keys.END)
+            # Wait for more cards to load; stop scrolling once the list stops growing
+            if not wait_until(driver, element_count_above(By.CSS_SELECTOR, '.base-card', card_count), 'scroll'):
+                print("No more jobs loaded")
+                break
+            queue_new_cards()
+        # Save the listing with every card loaded when recording a fixture corpus (no-op otherwise)
+        PAGES.capture(driver, 'listing')
+
+        # Collect the details in card order
+        for fetch in detail_fetches:
+            try:
+                job = fetch if isinstance(fetch, JobRecord) else fetch.result()
+            except Exception as e:
+                print("Job details not found for this card.")
+                continue
+            if store:
+                store.upsert(job, keyword)
+            job_skills.append(job.skills)
+    finally:
+        # Close the WebDrivers when done
+        executor.shutdown(wait=True)
+        client.close()
+        pool.close()
+        driver.quit()
+        print_wait_summary()
 
     #print(job_skills)
 
@@ -77,6 +164,7 @@ def scrape_linkedin_jobs(keyword, num_pages):
 
 
 # Function to extract job description using JavaScript
+@METRICS.timed('extract_description')
 def extract_job_description(driver):
     try:
         # Wait for the job description element to be present (you can adjust the timeout)
@@ -89,26 +177,23 @@ def extract_job_description(driver):
         return "Job description not found or couldn't be loaded"
 
 # Function to expand job description by clicking "show more" if available
+@METRICS.timed('expand_description')
 def expand_description(driver):
     try:
-        show_more_button = WebDriverWait(card, 10)\
+        show_more_button = WebDriverWait(driver, 10)\
             .until(EC.presence_of_element_located((By.CSS_SELECTOR, '.show-more-less-html__button')))
 
         show_more_button.click()
-        time.sleep(2)  # Wait for the description to expand
+        # Wait for the description to expand
+        wait_until(driver, attribute_equals(show_more_button, 'aria-expanded', 'true'), 'expand')
     except Exception as e:
         pass  # No "show more" button found or error occurred
 
 
-# Function to extract skills from a job title
+# Function to extract skills from a job description
 def extract_skills(description):
-    # This is a basic example, you can extend this to match more skills
-    skills = ['PostgreSQL','Snowflake','Databricks','Redshift','BigQuery','MongoDB','MySQL',
-              'Kafka','Kinesis','PubSub','Pub/sub','event hub','Airflow','dbt','NiFi', 'Fivetran','EMR','Redshit',
-            'Collibra','Denodo','presto','Starburst','Immuta','PowerBI','Tableau','Looker',
-             'Matillion','Alteryx','Informatica','Talend','EMR','Dataproc','Synapse','Python','SQL','Pyspark']
-    description = description.lower()
-    skills_list = [skill for skill in skills if skill.lower() in description]
+    # Uses the shared taxonomy in skill_taxonomy.json, matched on whole tokens
+    skills_list, _ = match_skills(description)
     print(skills_list)
     return skills_list
 
@@ -116,8 +201,12 @@ def extract_skills(description):
 if __name__ == "__main__":
     keyword = "data%20engineer"
     num_pages = 2 # You can adjust the number of pages to scrape
+    detail_backend = 'browser'  # 'http' fetches job pages without a browser when they are static
 
-    job_skills = scrape_linkedin_jobs(keyword, num_pages)
+    os.makedirs('skill_analysis', exist_ok=True)
+    store = JobStore('skill_analysis/linkedin_jobs.db')
+    job_skills = scrape_linkedin_jobs(keyword, num_pages, detail_backend=detail_backend, store=store)
+    store.close()
 
     print(f'Data engineer jobs: {len(job_skills)}')
 
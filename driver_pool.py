@@ -0,0 +1,113 @@
+import queue
+import threading
+from contextlib import contextmanager
+
+
+# Raised by DriverPool when a browser can't be started. The pool remembers the
+# failure and raises it again on later acquires instead of relaunching Chrome.
+class DriverStartError(RuntimeError):
+    pass
+
+
+# A bounded pool of long-lived WebDriver sessions.
+#
+# Browsers are started lazily, up to `size` of them, and handed out one at a
+# time with `session()`. A session goes back to the pool after use instead of
+# being quit, so Chrome startup is paid once per worker rather than per page.
+# With `max_uses`, a browser is recycled (quit and replaced on the next
+# acquire) after that many sessions, which keeps long runs from bloating.
+# If starting a browser fails, every later acquire raises DriverStartError.
+class DriverPool:
+    def __init__(self, create_driver, size, max_uses=None):
+        self.create_driver = create_driver
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._uses = {}
+        self._started = 0
+        self._start_error = None
+        self._lock = threading.Lock()
+
+    # Function to take an idle browser, starting a new one if the pool isn't full
+    def acquire(self):
+        while True:
+            if self._start_error is not None:
+                raise DriverStartError(f"Browser failed to start: {self._start_error}") from self._start_error
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                # Reserve the slot before the slow browser start
+                start_new = self._started < self.size
+                if start_new:
+                    self._started += 1
+            if start_new:
+                break
+
+            # Wait for a browser to come back; re-check in case one was discarded
+            try:
+                return self._idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+        try:
+            driver = self.create_driver()
+        except Exception as e:
+            with self._lock:
+                self._started -= 1
+                self._start_error = e
+            raise DriverStartError(f"Browser failed to start: {e}") from e
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    # Function to put a browser back, or replace it if it broke while in use
+    def release(self, driver, broken=False):
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+        if self.max_uses is not None and uses >= self.max_uses:
+            broken = True
+        if broken:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            # A WebDriver error can leave the browser in an unknown state
+            self.release(driver, broken=True)
+            raise
+        else:
+            self.release(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+                self._started -= 1
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    # Function to quit every browser the pool started
+    def close(self):
+        with self._lock:
+            drivers = self._drivers
+            self._drivers = []
+            self._uses = {}
+            self._started = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
@@ -0,0 +1,167 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# Elements that never have children
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+             'meta', 'param', 'source', 'track', 'wbr'}
+
+# Elements whose text is never shown on the page
+HIDDEN_TAGS = {'script', 'style', 'noscript', 'template', 'head', 'title'}
+
+# Elements that start a new line in rendered text, like innerText
+BLOCK_TAGS = {'address', 'article', 'aside', 'br', 'dd', 'div', 'dl', 'dt', 'footer',
+              'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main',
+              'nav', 'ol', 'p', 'pre', 'section', 'table', 'tr', 'ul'}
+
+# One step of the XPath subset the scrapers use: tag, optionally [contains(@class, "x")]
+XPATH_STEP = re.compile(r'''^(\*|[\w-]+)(?:\[contains\(@class,\s*['"]([^'"]+)['"]\)\])?$''')
+
+
+# A parsed HTML element
+class Node:
+    def __init__(self, tag, attrs, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+
+    def descendants(self):
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Node):
+                yield node
+                stack.extend(reversed(node.children))
+
+    # Function to get the element's visible text, with block elements on their own lines
+    def text(self):
+        parts = []
+        self._collect_text(parts)
+        lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    # Unlike innerText, inline elements are padded with a space so adjacent
+    # elements ("<a>Beta</a>Airflow") don't run together into one token
+    def _collect_text(self, parts):
+        if self.tag in HIDDEN_TAGS:
+            return
+        separator = '\n' if self.tag in BLOCK_TAGS else ' '
+        parts.append(separator)
+        for child in self.children:
+            if isinstance(child, Node):
+                child._collect_text(parts)
+            else:
+                parts.append(child)
+        parts.append(separator)
+
+    # Function to find elements with a selector from the scrapers' XPath lists.
+    # Supports "//tag", ".//tag", "[contains(@class, ...)]" and chained "//" steps,
+    # which covers every selector the scrapers define.
+    def xpath(self, selector):
+        steps = selector.lstrip('.').split('//')[1:]
+        nodes = [self]
+        for step in steps:
+            match = XPATH_STEP.match(step.strip())
+            if not match:
+                raise ValueError(f"Unsupported XPath step {step!r} in {selector!r}")
+            tag, class_part = match.groups()
+            found = []
+            seen = set()
+            for node in nodes:
+                for child in node.descendants():
+                    if id(child) in seen:
+                        continue
+                    if tag != '*' and child.tag != tag:
+                        continue
+                    if class_part and class_part not in child.attrs.get('class', ''):
+                        continue
+                    seen.add(id(child))
+                    found.append(child)
+            nodes = found
+        return nodes
+
+    # Function to find elements whose class list contains the given class, like a CSS ".name"
+    def by_class(self, name):
+        return [node for node in self.descendants() if name in node.attrs.get('class', '').split()]
+
+
+# Builds a Node tree from HTML, tolerating unclosed tags
+class TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document', {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Node(tag, {name: value or '' for name, value in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        # Close up to the matching open element; ignore stray end tags
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+# Function to parse an HTML document into a Node tree
+def parse_html(html):
+    builder = TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# Function to extract job tuples from parsed HTML, with the same selector lists and
+# the same {title, company, link, snippet, tags} shape as the in-browser batch script,
+# including the selectors that matched. Returns None when no listing selector matches.
+def extract_job_tuples(document, job_selectors, title_selectors, company_selectors, tag_selector, base_url=''):
+    def first_with_text(node, selectors):
+        for selector in selectors:
+            matches = node.xpath(selector)
+            if matches and matches[0].text():
+                return matches[0], selector
+        return None, None
+
+    for selector in job_selectors:
+        tuples = document.xpath(selector)
+        if not tuples:
+            continue
+        jobs = []
+        for tuple_node in tuples:
+            title, title_selector = first_with_text(tuple_node, title_selectors)
+            company, company_selector = first_with_text(tuple_node, company_selectors)
+            link = title.attrs.get('href') if title else None
+            if link and base_url:
+                link = urljoin(base_url, link)
+            jobs.append({
+                'title': title.text() if title else None,
+                'company': company.text() if company else None,
+                'link': link,
+                'snippet': tuple_node.text(),
+                'tags': [text for text in (node.text() for node in tuple_node.xpath(tag_selector)) if text],
+                'job_selector': selector,
+                'title_selector': title_selector,
+                'company_selector': company_selector,
+            })
+        return jobs
+    return None
+
+
+# Function to guess whether a page needs JavaScript to show its content.
+# Server-rendered pages have readable body text; app shells have little
+# besides a <noscript> notice and an empty mount point.
+def looks_js_only(document, min_text_length=200):
+    body = document.xpath('//body')
+    text = body[0].text() if body else document.text()
+    return len(text) < min_text_length
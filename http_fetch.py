@@ -0,0 +1,165 @@
+import asyncio
+import gzip
+import http.client
+import http.server
+import queue
+import threading
+import zlib
+from functools import partial
+from urllib.parse import urljoin, urlsplit
+
+from metrics import METRICS
+
+# Same browser identity the Selenium scrapers use
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Connection': 'keep-alive',
+}
+
+MAX_REDIRECTS = 5
+
+
+# The result of one HTTP GET
+class HttpResponse:
+    def __init__(self, url, status, headers, body):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        charset = 'utf-8'
+        content_type = self.headers.get('content-type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip()
+        return self.body.decode(charset, errors='replace')
+
+
+# A small HTTP client that keeps connections open and reuses them.
+#
+# Up to `connections_per_host` keep-alive connections are pooled per
+# scheme/host/port, so fetching many pages from one site pays the TCP and
+# TLS handshake once per connection instead of once per page. Safe to share
+# between threads.
+class HttpClient:
+    def __init__(self, connections_per_host=4, timeout=20, headers=None):
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, origin):
+        with self._lock:
+            if origin not in self._pools:
+                self._pools[origin] = queue.LifoQueue(maxsize=self.connections_per_host)
+            return self._pools[origin]
+
+    def _connect(self, scheme, host, port):
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    # Function to send one request on a pooled connection, retrying on a fresh one when a
+    # kept-alive connection turns out to be stale. A fresh connection's failure is raised.
+    def _request(self, url):
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        pool = self._pool(origin)
+        while True:
+            try:
+                connection, reused = pool.get_nowait(), True
+            except queue.Empty:
+                connection, reused = self._connect(*origin), False
+            try:
+                connection.request('GET', path, headers=self.headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                connection.close()
+                # A kept-alive connection the server already closed; try the next one.
+                # The pool is bounded, so this ends with a fresh connection at the latest.
+                if reused:
+                    METRICS.count('retries', reason='stale_connection')
+                    continue
+                raise
+
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            if response.will_close:
+                connection.close()
+            else:
+                try:
+                    pool.put_nowait(connection)
+                except queue.Full:
+                    connection.close()
+            return response.status, headers, body
+
+    # Function to GET a URL, following redirects and decoding gzip/deflate bodies
+    def get(self, url):
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = self._request(url)
+            if status in (301, 302, 303, 307, 308) and 'location' in headers:
+                url = urljoin(url, headers['location'])
+                continue
+            encoding = headers.get('content-encoding', '')
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            elif encoding == 'deflate':
+                body = zlib.decompress(body)
+            return HttpResponse(url, status, headers, body)
+        raise http.client.HTTPException(f"Too many redirects fetching {url}")
+
+    # Function to close every pooled connection
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+# Function to fetch many URLs concurrently with asyncio, at most `concurrency` at a time.
+# Returns responses in the same order as the URLs; a failed fetch gives its exception.
+async def fetch_all_async(client, urls, concurrency=4):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url):
+        async with semaphore:
+            return await asyncio.to_thread(client.get, url)
+
+    return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+
+# Function to fetch many URLs concurrently from synchronous code
+def fetch_all(client, urls, concurrency=4):
+    return asyncio.run(fetch_all_async(client, urls, concurrency))
+
+
+# Static file handler that speaks keep-alive HTTP/1.1 and doesn't log every request
+class QuietFileHandler(http.server.SimpleHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Function to serve a directory of saved HTML pages on a local port, for offline runs.
+# `handler` can be a QuietFileHandler subclass that maps requests to files differently.
+# Returns the running server and its base URL; call server.shutdown() when done.
+def serve_directory(directory, port=0, handler=QuietFileHandler):
+    handler = partial(handler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,66 @@
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field
+
+from skill_matcher import match_skills
+
+
+# One scraped job posting together with the skills matched in it.
+#
+# Skills are matched once, when the record is created, and carried with the
+# record from then on; aggregation and re-analysis read `skills` and
+# `skill_categories` instead of re-tokenising the description.
+@dataclass
+class JobRecord:
+    title: str
+    company: str = None
+    description: str = ''
+    link: str = None
+    tags: list = field(default_factory=list)
+    skills: list = field(default_factory=list)
+    skill_categories: list = field(default_factory=list)
+
+    # Function to create a record and match its skills in one step
+    @classmethod
+    def from_description(cls, title, company, description, link=None, tags=None):
+        skills, skill_categories = match_skills(description)
+        return cls(title=title, company=company, description=description, link=link,
+                   tags=list(tags or []), skills=skills, skill_categories=skill_categories)
+
+    # Function to load a record saved with to_dict
+    @classmethod
+    def from_dict(cls, data):
+        data = dict(data)
+        data['skill_categories'] = [tuple(pair) for pair in data.get('skill_categories', [])]
+        return cls(**data)
+
+    def to_dict(self):
+        return asdict(self)
+
+    # Function to get a stable ID that identifies the same posting across pages and runs.
+    # Uses the posting URL without its query string (tracking parameters change between
+    # pages), or the title, company and description when there is no link.
+    def key(self):
+        if self.link:
+            source = self.link.split('?')[0].split('#')[0].rstrip('/')
+        else:
+            source = '\n'.join([self.title or '', self.company or '', ' '.join(self.description.split())])
+        return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+    # Function to re-run skill matching, e.g. after the taxonomy changed
+    def rematch(self):
+        self.skills, self.skill_categories = match_skills(self.description)
+        return self
+
+
+# Function to save job records as JSON lines for later re-analysis
+def save_jobs(path, jobs):
+    with open(path, 'w', encoding='utf-8') as f:
+        for job in jobs:
+            f.write(json.dumps(job.to_dict()) + '\n')
+
+
+# Function to load job records saved with save_jobs
+def load_jobs(path):
+    with open(path, encoding='utf-8') as f:
+        return [JobRecord.from_dict(json.loads(line)) for line in f if line.strip()]
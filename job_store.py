@@ -0,0 +1,184 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from job_record import JobRecord
+from skill_matcher import TAXONOMY
+
+DEFAULT_STORE_PATH = 'skill_analysis/jobs.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    link TEXT,
+    description TEXT,
+    tags TEXT,
+    skills TEXT,
+    skill_categories TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    times_seen INTEGER,
+    taxonomy_version TEXT
+);
+CREATE TABLE IF NOT EXISTS job_searches (
+    job_id TEXT REFERENCES jobs(job_id),
+    keyword TEXT,
+    first_seen TEXT,
+    PRIMARY KEY (job_id, keyword)
+);
+"""
+
+# Pages in a row whose jobs are all stored already before a crawl stops early.
+# Results are ranked by relevance, not date, so new postings can sit behind a known page.
+KNOWN_PAGES_TO_STOP = 3
+
+
+# A local SQLite store of every job posting seen so far, keyed by JobRecord.key().
+#
+# Upserting a job that is already stored only bumps its last_seen and
+# times_seen, so re-runs can tell new postings from known ones, skip detail
+# work for known jobs and stop paginating once pages have nothing new.
+# Every job also remembers the search keywords it was found under, so
+# several searches can share one store: "new" and the analysis are per
+# search. Each job also keeps the version of the skill taxonomy its skills
+# were matched with; reading a job matched with an older taxonomy rematches
+# it and saves the new skills, so re-analysis picks up taxonomy changes
+# without rescraping. Safe to share between the scraper's worker threads.
+class JobStore:
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        # Stores created before taxonomy versions were kept; their jobs count as stale
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if 'taxonomy_version' not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN taxonomy_version TEXT")
+        self._conn.commit()
+
+    # Function to insert or refresh a batch of jobs found by a search for `keyword`.
+    # Returns the jobs that were new: new to that search when a keyword is given, else new to the store.
+    def upsert_many(self, jobs, keyword=None):
+        now = datetime.now().isoformat(timespec='seconds')
+        new_jobs = []
+        with self._lock, self._conn:
+            for job in jobs:
+                job_id = job.key()
+                known = self._conn.execute(
+                    "UPDATE jobs SET last_seen = ?, times_seen = times_seen + 1 WHERE job_id = ?",
+                    (now, job_id)).rowcount > 0
+                if not known:
+                    self._conn.execute(
+                        "INSERT INTO jobs (job_id, title, company, link, description, tags, skills, skill_categories, "
+                        "first_seen, last_seen, times_seen, taxonomy_version) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, ?)",
+                        (job_id, job.title, job.company, job.link, job.description, json.dumps(job.tags),
+                         json.dumps(job.skills), json.dumps(job.skill_categories), now, now, TAXONOMY.version))
+                if keyword is not None:
+                    # Known to this search only if the search found it before
+                    known = self._conn.execute(
+                        "INSERT OR IGNORE INTO job_searches VALUES (?, ?, ?)", (job_id, keyword, now)).rowcount == 0
+                if not known:
+                    new_jobs.append(job)
+        return new_jobs
+
+    # Function to insert or refresh one job; returns True if it was new
+    def upsert(self, job, keyword=None):
+        return bool(self.upsert_many([job], keyword))
+
+    # Function to get one stored job by ID, or None
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, title, company, description, link, tags, skills, skill_categories, taxonomy_version "
+                "FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._records([row])[0] if row else None
+
+    # Function to iterate over every stored job, oldest first, reading `batch_size` rows at a time.
+    # With a keyword, only the jobs found by that search.
+    def iter_jobs(self, batch_size=500, keyword=None):
+        query = ("SELECT jobs.rowid, job_id, title, company, description, link, tags, skills, skill_categories, "
+                 "taxonomy_version FROM jobs WHERE jobs.rowid > ?")
+        if keyword is not None:
+            query += " AND job_id IN (SELECT job_id FROM job_searches WHERE keyword = ?)"
+        query += " ORDER BY jobs.rowid LIMIT ?"
+        last_rowid = 0
+        while True:
+            params = [last_rowid] + ([keyword] if keyword is not None else []) + [batch_size]
+            with self._lock:
+                rows = self._conn.execute(query, params).fetchall()
+            if not rows:
+                return
+            yield from self._records([row[1:] for row in rows])
+            last_rowid = rows[-1][0]
+
+    def load_jobs(self, keyword=None):
+        return list(self.iter_jobs(keyword=keyword))
+
+    def count(self, keyword=None):
+        with self._lock:
+            if keyword is None:
+                return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM job_searches WHERE keyword = ?", (keyword,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Function to turn stored rows into JobRecords, rematching (and saving) any whose
+    # skills came from an older taxonomy
+    def _records(self, rows):
+        records = []
+        stale = []
+        for job_id, title, company, description, link, tags, skills, skill_categories, version in rows:
+            job = JobRecord.from_dict({
+                'title': title, 'company': company, 'description': description, 'link': link,
+                'tags': json.loads(tags), 'skills': json.loads(skills),
+                'skill_categories': json.loads(skill_categories),
+            })
+            if version != TAXONOMY.version and description:
+                job.rematch()
+                stale.append((json.dumps(job.skills), json.dumps(job.skill_categories), TAXONOMY.version, job_id))
+            records.append(job)
+        if stale:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE jobs SET skills = ?, skill_categories = ?, taxonomy_version = ? WHERE job_id = ?", stale)
+        return records
+
+
+# Decides when a crawl has reached postings it already knows.
+#
+# Pages can finish in any order (parallel browsers, the crawl scheduler).
+# A page counts as known when every job on it was stored already; once
+# `limit` consecutive pages are known, every page after that run can be
+# skipped. Safe to share between threads.
+class KnownPageTracker:
+    def __init__(self, limit=KNOWN_PAGES_TO_STOP):
+        self.limit = limit
+        self.known_pages = set()
+        self.stop_after = None
+        self._lock = threading.Lock()
+
+    # Function to record whether every job on a page was already stored; returns True once the crawl can stop
+    def page_done(self, page, all_known):
+        with self._lock:
+            if all_known:
+                self.known_pages.add(page)
+                for first in range(page - self.limit + 1, page + 1):
+                    if all(other in self.known_pages for other in range(first, first + self.limit)):
+                        last = first + self.limit - 1
+                        self.stop_after = last if self.stop_after is None else min(self.stop_after, last)
+            return self.stop_after is not None
+
+    # Function to tell whether a page still needs scraping
+    def wanted(self, page):
+        return self.stop_after is None or page <= self.stop_after
+
+    # Function to skip every page not started yet, e.g. when the consumer stops early
+    def stop(self):
+        with self._lock:
+            self.stop_after = 0
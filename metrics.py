@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+
+DEFAULT_REPORT_PATH = 'skill_analysis/run_report.json'
+DEFAULT_PROMETHEUS_PATH = 'skill_analysis/run_metrics.prom'
+
+# 'full' times every stage, 'light' skips the per-job and per-description stages
+# (the only ones called often enough for timing to cost anything), 'off' records nothing
+LEVELS = ('off', 'light', 'full')
+
+# Histogram bucket upper bounds, in seconds, for page loads
+PAGE_LOAD_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0)
+
+NULL_TIMER = nullcontext()
+
+
+# Function to turn keyword labels into a hashable, ordered key part
+def label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+# Function to format labels for the Prometheus text format
+def prometheus_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = [(name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for name, value in pairs]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+# Stage timers, counters and histograms for one scrape run.
+#
+# Stages are timed with `with METRICS.stage('name'):` or the @METRICS.timed
+# decorator and keep calls, total and max seconds. Counters count events
+# such as selector misses, fallbacks, waits and retries. Histograms bucket
+# values such as page-load latency. Anything can carry labels (e.g.
+# group='title'). report() gives everything as a dict, saved as JSON with
+# save(); prometheus_text() gives the same numbers in the Prometheus text
+# exposition format. Safe to share between threads.
+class Metrics:
+    def __init__(self, level='full', prefix='naukri_scraper'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.configure(level)
+        self.reset()
+
+    # Function to switch between 'full', 'light' and 'off'
+    def configure(self, level):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown metrics level {level!r}; expected one of {', '.join(LEVELS)}")
+        self.level = level
+        self.enabled = level != 'off'
+        self.detailed = level == 'full'
+
+    # Function to clear everything recorded and restart the run clock
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.timers = {}
+            self.counters = {}
+            self.histograms = {}
+
+    # Function to add one timed call of a stage
+    def record_time(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (name, label_key(labels))
+        with self._lock:
+            calls, total, longest = self.timers.get(key, (0, 0.0, 0.0))
+            self.timers[key] = (calls + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def _timer(self, name, labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, time.perf_counter() - start, **labels)
+
+    # Function to time a block: `with METRICS.stage('extract_page'):`.
+    # Fine stages (called per job or per description) are only timed at the 'full' level.
+    def stage(self, name, fine=False, **labels):
+        if not self.enabled or (fine and not self.detailed):
+            return NULL_TIMER
+        return self._timer(name, labels)
+
+    # Function to time every call of a function as a stage
+    def timed(self, name, fine=False):
+        def decorate(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or (fine and not self.detailed):
+                    return function(*args, **kwargs)
+                with self._timer(name, {}):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Function to add to a counter
+    def count(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    # Function to add a value to a histogram; a histogram keeps the buckets it was first given
+    def observe(self, name, value, buckets=PAGE_LOAD_BUCKETS, **labels):
+        if not self.enabled:
+            return
+        key = (name, label_key(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = {'buckets': tuple(buckets), 'counts': [0] * (len(buckets) + 1), 'count': 0, 'sum': 0.0}
+                self.histograms[key] = histogram
+            histogram['counts'][bisect_left(histogram['buckets'], value)] += 1
+            histogram['count'] += 1
+            histogram['sum'] += value
+
+    # Function to get everything recorded so far as a JSON-ready dict
+    def report(self):
+        with self._lock:
+            timers = dict(self.timers)
+            counters = dict(self.counters)
+            histograms = {key: dict(histogram, counts=list(histogram['counts']))
+                          for key, histogram in self.histograms.items()}
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'seconds': time.perf_counter() - self._start,
+            'level': self.level,
+            'stages': [{'name': name, 'labels': dict(labels), 'calls': calls, 'seconds': total, 'max_seconds': longest}
+                       for (name, labels), (calls, total, longest) in sorted(timers.items())],
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in sorted(counters.items())],
+            'histograms': [{'name': name, 'labels': dict(labels), 'buckets': list(histogram['buckets']),
+                            'counts': histogram['counts'], 'count': histogram['count'], 'sum': histogram['sum']}
+                           for (name, labels), histogram in sorted(histograms.items())],
+        }
+
+    # Function to write the run report as JSON, atomically
+    def save(self, path=DEFAULT_REPORT_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=1)
+        os.replace(temp_path, path)
+        print(f"Run report saved to: {path}")
+
+    # Function to render everything recorded in the Prometheus text exposition format
+    def prometheus_text(self):
+        report = self.report()
+        prefix = self.prefix
+        lines = [f"# TYPE {prefix}_run_seconds gauge", f"{prefix}_run_seconds {report['seconds']:.6f}"]
+
+        if report['stages']:
+            lines.append(f"# TYPE {prefix}_stage_seconds_total counter")
+            for stage in report['stages']:
+                labels = prometheus_labels([('stage', stage['name'])] + sorted(stage['labels'].items()))
+                lines.append(f"{prefix}_stage_seconds_total{labels} {stage['seconds']:.6f}")
+            lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+            for stage in report['stages']:
+                labels = prometheus_labels([('stage', stage['name'])] + sorted(stage['labels'].items()))
+                lines.append(f"{prefix}_stage_calls_total{labels} {stage['calls']}")
+
+        declared = set()
+        for counter in report['counters']:
+            metric = f"{prefix}_{counter['name']}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{prometheus_labels(sorted(counter['labels'].items()))} {counter['value']}")
+
+        for histogram in report['histograms']:
+            metric = f"{prefix}_{histogram['name']}"
+            labels = sorted(histogram['labels'].items())
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} histogram")
+                declared.add(metric)
+            cumulative = 0
+            for bound, count in zip(list(histogram['buckets']) + ['+Inf'], histogram['counts']):
+                cumulative += count
+                lines.append(f"{metric}_bucket{prometheus_labels(labels, [('le', str(bound))])} {cumulative}")
+            lines.append(f"{metric}_sum{prometheus_labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{metric}_count{prometheus_labels(labels)} {histogram['count']}")
+        return '\n'.join(lines) + '\n'
+
+    # Function to write the Prometheus text format, e.g. for node_exporter's textfile collector
+    def save_prometheus(self, path=DEFAULT_PROMETHEUS_PATH):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(temp_path, path)
+        print(f"Prometheus metrics saved to: {path}")
+
+    # Function to print where the run spent its time and the non-zero counters
+    def print_summary(self, top=10):
+        if not self.enabled:
+            return
+        report = self.report()
+        print(f"\nRun took {report['seconds']:.1f}s; slowest stages:")
+        for stage in sorted(report['stages'], key=lambda stage: -stage['seconds'])[:top]:
+            labels = ', '.join(f"{name}={value}" for name, value in stage['labels'].items())
+            name = f"{stage['name']} ({labels})" if labels else stage['name']
+            print(f"  {name}: {stage['seconds']:.1f}s over {stage['calls']} calls, {stage['max_seconds']:.2f}s max")
+        for counter in report['counters']:
+            labels = ', '.join(f"{name}={value}" for name, value in counter['labels'].items())
+            name = f"{counter['name']} ({labels})" if labels else counter['name']
+            print(f"  {name}: {counter['value']}")
+
+
+# Shared metrics for the current run
+METRICS = Metrics()
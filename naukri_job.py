@@ -3,91 +3,327 @@ from selenium.webdriver.chrome.options import Options
 import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from collections import Counter
 import re
-import matplotlib.pyplot as plt
 import pandas as pd
 import os
+import argparse
+import asyncio
+import queue
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from urllib.parse import quote
+from skill_matcher import match_skills
+from skill_aggregator import SkillAggregator
+from job_record import JobRecord
+from job_store import KNOWN_PAGES_TO_STOP, JobStore, KnownPageTracker
+from crawl_checkpoint import CrawlCheckpoint
+import pipeline
+from chart_render import bar_chart_spec, pie_chart_spec, render_charts
+from output_manifest import OutputManifest, write_csv_if_changed
+from columnar_export import ColumnarWriter
+from skill_history import SkillHistory
+from near_duplicates import DuplicateReport, NearDuplicateIndex
+from crawler import CrawlScheduler
+from driver_pool import DriverPool, DriverStartError
+from pagination import DEFAULT_STRATEGY_PATH, PaginationEngine
+from selector_registry import SelectorRegistry
+from page_replay import PAGES
+from metrics import METRICS
+from html_extract import extract_job_tuples, looks_js_only, parse_html
+from http_fetch import HttpClient, fetch_all
+from waits import (any_element_present, any_of, element_count_stable, network_idle,
+                   print_wait_summary, wait_until)
 
-# Function to scrape Naukri job postings and extract skills
-def scrape_naukri_jobs(keyword, num_pages):
-    job_details = []
+# Job listings can appear under multiple possible selectors
+# These are based on recent inspection of Naukri.com
+JOB_SELECTORS = [
+    "//div[contains(@class, 'srp-jobtuple')]",  # Modern Naukri layout
+    "//div[contains(@class, 'jobTupleHeader')]",  # Alternate layout
+    "//article[contains(@class, 'jobTuple')]"     # Another variation
+]
+
+# Where searches are sent unless a scraper is given another base URL
+NAUKRI_URL = 'https://www.naukri.com'
+
+# Title and company selectors, relative to a job listing
+TITLE_SELECTORS = [
+    './/a[contains(@class, "title")]',
+    './/a[contains(@class, "jobTitle")]',
+    './/a[contains(@class, "jdTitle")]'
+]
+
+COMPANY_SELECTORS = [
+    './/a[contains(@class, "companyName")]',
+    './/a[contains(@class, "company")]',
+    './/span[contains(@class, "subTitle")]',
+    './/div[contains(@class, "companyInfo")]'
+]
+
+# Skill tags shown on a job listing, relative to the listing
+TAG_SELECTOR = './/ul[contains(@class, "tags")]//li'
 
+# JavaScript that extracts every job listing on the page in a single round trip.
+# It takes the selector lists in the registry's current order and returns a list of
+# {title, company, link, snippet, tags} objects, plus the selectors that matched
+# each one, or null when none of the listing selectors match.
+EXTRACT_JOBS_JS = '''
+const [jobSelectors, titleSelectors, companySelectors, tagSelector] = arguments;
+const all = (xpath, context) => {
+    const result = document.evaluate(xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    return nodes;
+};
+const text = node => (node.innerText || node.textContent || '').trim();
+const firstWithText = (context, selectors) => {
+    for (const selector of selectors) {
+        const node = all(selector, context)[0];
+        if (node && text(node)) return [node, selector];
+    }
+    return [null, null];
+};
+for (const selector of jobSelectors) {
+    const tuples = all(selector, document);
+    if (!tuples.length) continue;
+    return tuples.map(tuple => {
+        const [title, titleSelector] = firstWithText(tuple, titleSelectors);
+        const [company, companySelector] = firstWithText(tuple, companySelectors);
+        return {
+            title: title ? text(title) : null,
+            company: company ? text(company) : null,
+            link: title && title.href ? title.href : null,
+            snippet: tuple.innerText || '',
+            tags: all(tagSelector, tuple).map(text).filter(Boolean),
+            job_selector: selector,
+            title_selector: titleSelector,
+            company_selector: companySelector,
+        };
+    });
+}
+return null;
+'''
+
+# Selector lists reordered by how well each selector has been working, saved between runs
+SELECTORS = SelectorRegistry()
+SELECTORS.register('job', JOB_SELECTORS)
+SELECTORS.register('title', TITLE_SELECTORS)
+SELECTORS.register('company', COMPANY_SELECTORS)
+
+# Function to start a Chrome WebDriver with the scraper's options
+@METRICS.timed('start_browser')
+def create_driver(headless=False):
     # Set up options for the Chrome WebDriver
     options = webdriver.ChromeOptions()
+    if headless or PAGES.replaying:  # Replays always run headless
+        options.add_argument('--headless')
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-notifications")  # Disable notifications
     options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36")
 
-    # Start a Selenium WebDriver with options
-    driver = webdriver.Chrome(options=options)
+    # Start a Selenium WebDriver with options; page recording/replay hooks in when enabled
+    return PAGES.wrap_driver(webdriver.Chrome(options=options))
+
+# Function to build a Naukri search keyword for a role, optionally narrowed by location and years of experience,
+# in the same "role-jobs-in-city?k=...&l=...&experience=N" form the site's own search box produces
+def build_search_keyword(role, location=None, experience=None):
+    slug = '-'.join(role.lower().split())
+    keyword = f"{slug}-jobs"
+    params = [f"k={quote(role.lower())}"]
+    if location:
+        keyword += f"-in-{'-'.join(location.lower().split())}"
+        params.append(f"l={quote(location.lower())}")
+    if experience is not None:
+        params.append(f"experience={experience}")
+    return f"{keyword}?{'&'.join(params)}"
+
+# Function to build the search URL for a given results page.
+# base_url points the search at another server, e.g. saved fixture pages served locally.
+def build_page_url(keyword, page=1, base_url=NAUKRI_URL):
+    # Search URL for Naukri; a bare keyword like "data-engineer" gets the "-jobs" suffix
+    if '-jobs' in keyword.partition('?')[0]:
+        url = f'{base_url}/{keyword}'
+    else:
+        url = f'{base_url}/{keyword}-jobs'
+    if page <= 1:
+        return url
+
+    # Later pages use Naukri's ".../page-N" form, with any query string kept at the end
+    path, _, query = url.partition('?')
+    page_url = f"{path.rstrip('/')}/page-{page}"
+    return f"{page_url}?{query}" if query else page_url
+
+# Function to wait until the job listings have rendered.
+# Returns once the job-tuple count stops changing, or once the network goes idle
+# without any tuples appearing (the page-text fallback will handle that page).
+def wait_for_job_listings(driver):
+    return wait_until(driver, any_of(element_count_stable(By.XPATH, JOB_SELECTORS),
+                                     network_idle(idle_for=1.0)), 'job_listings')
+
+# Function to get something that identifies the page currently shown: the first job's text
+def page_marker(driver):
+    for selector in JOB_SELECTORS:
+        elements = driver.find_elements(By.XPATH, selector)
+        if elements:
+            return elements[0].text
+    return None
+
+# Function to extract every job on the page with one execute_script round trip.
+# Returns None if the script fails or no listing selector matches.
+def extract_jobs_batch(driver):
+    selectors = [SELECTORS.ordered(group) for group in ('job', 'title', 'company')]
+    try:
+        tuples = driver.execute_script(EXTRACT_JOBS_JS, *selectors, TAG_SELECTOR)
+    except Exception as e:
+        print(f"Batch extraction failed: {str(e)}")
+        return None
+    if not tuples:
+        # The per-element fallback tries (and counts) the selectors next
+        return None
+    record_selector_hits(tuples, *selectors)
+    return records_from_tuples(tuples)
+
+# Function to count which selectors matched in a batch extraction, as if each had been tried in turn
+def record_selector_hits(tuples, job_selectors, title_selectors, company_selectors):
+    SELECTORS.record_match('job', job_selectors, tuples[0]['job_selector'] if tuples else None)
+    for job in tuples or []:
+        SELECTORS.record_match('title', title_selectors, job['title_selector'])
+        SELECTORS.record_match('company', company_selectors, job['company_selector'])
+
+# Function to save the selector stats and report their hit rates at the end of a scrape
+def finish_selectors():
+    SELECTORS.report()
+    SELECTORS.save()
+
+# Function to turn extracted {title, company, link, snippet, tags} tuples into job records
+def records_from_tuples(tuples):
+    return [JobRecord.from_description(job['title'], job['company'], job['snippet'],
+                                       link=job['link'], tags=job['tags'])
+            for job in tuples if job['title']]
+
+# Function to extract every job listed on the page the driver is showing
+@METRICS.timed('extract_page')
+def extract_page_jobs(driver):
+    # Save the rendered page when recording a fixture corpus (no-op otherwise)
+    PAGES.capture(driver, 'listing')
+    
+    # One round trip for the whole page; fall back to per-element lookups if it fails
+    METRICS.count('pages', backend='browser')
+    page_jobs = extract_jobs_batch(driver)
+    if page_jobs is not None:
+        print(f"Found {len(page_jobs)} job listings!")
+        METRICS.count('jobs_extracted', len(page_jobs), backend='browser')
+        return page_jobs
+
+    METRICS.count('fallbacks', kind='per_element')
+    page_jobs = []
+    # Try the listing selectors, best first
+    job_elements = SELECTORS.first('job', lambda selector: driver.find_elements(By.XPATH, selector))
+    if job_elements:
+        print(f"Found {len(job_elements)} job listings!")
+        
+        # Process each job listing
+        for i, job_element in enumerate(job_elements):
+            try:
+                job_info = extract_job_info(job_element)
+                if job_info:
+                    page_jobs.append(job_info)
+            except Exception as e:
+                print(f"Error processing job {i+1}: {str(e)}")
+    else:
+        # Fallback: try to extract text from the whole page
+        print("Could not find structured job listings, extracting from page text")
+        METRICS.count('fallbacks', kind='page_text')
+        page_text = driver.find_element(By.TAG_NAME, 'body').text
+        text_based_jobs = extract_jobs_from_text(page_text)
+        if text_based_jobs:
+            page_jobs.extend(text_based_jobs)
+            print(f"Added {len(text_based_jobs)} jobs from text parsing")
+        else:
+            print("No jobs could be extracted from page text")
+
+    METRICS.count('jobs_extracted', len(page_jobs), backend='browser')
+    return page_jobs
+
+# Function to save a page's jobs in the store under the search keyword; returns True once the crawl can stop.
+# Results are ranked by relevance, not date, so a page of known jobs doesn't mean the rest are known:
+# known_pages (a KnownPageTracker) only stops the crawl after several such pages in a row.
+def store_page_jobs(store, page, page_jobs, keyword, known_pages):
+    if store is None:
+        return False
+    all_known = False
+    if page_jobs:
+        new_jobs = store.upsert_many(page_jobs, keyword)
+        print(f"Page {page}: {len(new_jobs)} new of {len(page_jobs)} jobs")
+        all_known = not new_jobs
+    return known_pages.page_done(page, all_known)
+
+# Function to save or clear the crawl checkpoint when a scrape stops
+def finish_checkpoint(checkpoint, finished):
+    if checkpoint is None:
+        return
+    if finished:
+        checkpoint.clear()
+    else:
+        checkpoint.save()
+        print(f"Crawl stopped early; run again with --resume to continue from page {checkpoint.next_page()}")
+
+# Function to scrape Naukri job postings and extract skills, yielding each job as its page is scraped.
+# With a JobStore, jobs are saved as they are scraped and pagination stops at the first fully known page.
+# With a CrawlCheckpoint, progress is saved as pages complete and a loaded checkpoint resumes the crawl.
+def iter_naukri_jobs(keyword, num_pages, store=None, checkpoint=None):
+    # Jobs restored from a checkpoint come first
+    resumed_jobs = list(checkpoint.jobs) if checkpoint else []
+    yield from resumed_jobs
+    jobs_added = len(resumed_jobs)
+    start_page = checkpoint.next_page() if checkpoint else 1
+    finished = False
+    known_pages = KnownPageTracker()
+
+    driver = create_driver()
 
     try:
-        # Search URL for Naukri
-        url = f'https://www.naukri.com/{keyword}-jobs'
+        url = build_page_url(keyword, start_page)
         print(f"Opening URL: {url}")
+        load_started = time.perf_counter()
         driver.get(url)
-        time.sleep(3)  # Wait for initial page load
+        wait_for_job_listings(driver)  # Wait for initial page load
+        METRICS.observe('page_load_seconds', time.perf_counter() - load_started, via='url')
         
         # Print page title for debugging
         print(f"Current page title: {driver.title}")
 
+        pagination = create_pagination_engine()
+        page_jobs = extract_page_jobs(driver)
+        pagination.page_loaded(page_jobs)
+        
         # Loop through the specified number of pages
-        for page in range(1, num_pages + 1):
+        for page in range(start_page, num_pages + 1):
             print(f"\n--- Scraping page {page} of {num_pages} ---")
             
-            # Wait for job listings to appear using multiple possible selectors
-            # These are based on recent inspection of Naukri.com
-            job_selectors = [
-                "//div[contains(@class, 'srp-jobtuple')]",  # Modern Naukri layout
-                "//div[contains(@class, 'jobTupleHeader')]",  # Alternate layout
-                "//article[contains(@class, 'jobTuple')]"     # Another variation
-            ]
+            for job_info in page_jobs:
+                jobs_added += 1
+                print(f"Added job {jobs_added}: {job_info.title} at {job_info.company}")
+            if checkpoint:
+                checkpoint.page_done(page, driver.current_url, page_jobs)
+            all_known = store_page_jobs(store, page, page_jobs, keyword, known_pages)
+            yield from page_jobs
             
-            jobs_found = False
-            for selector in job_selectors:
-                try:
-                    print(f"Trying to find jobs with selector: {selector}")
-                    job_elements = driver.find_elements(By.XPATH, selector)
-                    if job_elements:
-                        print(f"Found {len(job_elements)} job listings!")
-                        jobs_found = True
-                        
-                        # Process each job listing
-                        for i, job_element in enumerate(job_elements):
-                            try:
-                                job_info = extract_job_info(job_element)
-                                if job_info:
-                                    job_details.append(job_info)
-                                    print(f"Added job {len(job_details)}: {job_info['title']} at {job_info['company']}")
-                            except Exception as e:
-                                print(f"Error processing job {i+1}: {str(e)}")
-                        break
-                except Exception as e:
-                    print(f"Error with selector {selector}: {str(e)}")
-            
-            if not jobs_found:
-                # Fallback: try to extract text from the whole page
-                print("Could not find structured job listings, extracting from page text")
-                page_text = driver.find_element(By.TAG_NAME, 'body').text
-                text_based_jobs = extract_jobs_from_text(page_text)
-                if text_based_jobs:
-                    job_details.extend(text_based_jobs)
-                    print(f"Added {len(text_based_jobs)} jobs from text parsing")
-                else:
-                    print("No jobs could be extracted from page text")
+            if all_known:
+                print(f"The last {KNOWN_PAGES_TO_STOP} pages only had stored jobs, stopping pagination")
+                finished = True
+                break
             
-            # Navigate to next page if needed
+            # Navigate to next page if needed; the engine checks the new page really has new jobs
             if page < num_pages:
-                next_clicked = click_next_page(driver)
-                if not next_clicked:
+                page_jobs = pagination.advance(driver, keyword, page + 1)
+                if page_jobs is None:
                     print("Could not navigate to next page, stopping pagination")
                     break
-                time.sleep(3)  # Wait for next page to load
+        else:
+            finished = True
     
     except Exception as e:
         print(f"Error during scraping: {str(e)}")
@@ -95,45 +331,289 @@ def scrape_naukri_jobs(keyword, num_pages):
     finally:
         # Close the WebDriver when done
         driver.quit()
-    
-    return job_details
+        print_wait_summary()
+        finish_selectors()
+        finish_checkpoint(checkpoint, finished)
+
+# Function to scrape Naukri job postings into a list
+def scrape_naukri_jobs(keyword, num_pages, store=None, checkpoint=None):
+    return list(iter_naukri_jobs(keyword, num_pages, store, checkpoint))
+
+# Function to scrape one results page by loading its URL directly
+def scrape_page(driver, keyword, page, base_url=NAUKRI_URL):
+    url = build_page_url(keyword, page, base_url)
+    print(f"Opening page {page}: {url}")
+    load_started = time.perf_counter()
+    driver.get(url)
+    wait_for_job_listings(driver)  # Wait for page load
+    METRICS.observe('page_load_seconds', time.perf_counter() - load_started, via='url')
+    return extract_page_jobs(driver)
+
+# Function to extract jobs from a results page fetched over plain HTTP.
+# Returns None when the page is an app shell that needs a browser to render.
+@METRICS.timed('extract_page')
+def extract_http_page_jobs(response):
+    PAGES.capture_html(response.url, response.text, 'listing')
+    METRICS.count('pages', backend='http')
+    document = parse_html(response.text)
+    selectors = [SELECTORS.ordered(group) for group in ('job', 'title', 'company')]
+    tuples = extract_job_tuples(document, *selectors, TAG_SELECTOR, base_url=response.url)
+    # Error pages, 404s and pages without listings say nothing about whether the selectors still work
+    if tuples and response.status == 200:
+        record_selector_hits(tuples, *selectors)
+    if tuples:
+        page_jobs = records_from_tuples(tuples)
+        METRICS.count('jobs_extracted', len(page_jobs), backend='http')
+        return page_jobs
+    if response.status != 200 or looks_js_only(document):
+        return None
+
+    # Same fallback as the browser path: parse the page's visible text
+    print("Could not find structured job listings, extracting from page text")
+    METRICS.count('fallbacks', kind='page_text')
+    page_jobs = extract_jobs_from_text(document.text())
+    METRICS.count('jobs_extracted', len(page_jobs), backend='http')
+    return page_jobs
+
+# Function to scrape pages over keep-alive HTTP, using a browser only for pages that need JavaScript.
+# Pages are fetched `concurrency` at a time and their jobs yielded in page order.
+def iter_naukri_jobs_http(keyword, num_pages, concurrency=4, store=None, checkpoint=None, base_url=NAUKRI_URL):
+    client = HttpClient(connections_per_host=concurrency)
+    pages = [page for page in range(1, num_pages + 1) if not (checkpoint and checkpoint.is_done(page))]
+    driver = None
+    finished = False
+    known_pages = KnownPageTracker()
+
+    resumed_jobs = list(checkpoint.jobs) if checkpoint else []
+    yield from resumed_jobs
+    seen = {job_info.key() for job_info in resumed_jobs}
+    jobs_added = len(resumed_jobs)
+    try:
+        for batch_start in range(0, len(pages), concurrency):
+            batch = pages[batch_start:batch_start + concurrency]
+            urls = [build_page_url(keyword, page, base_url) for page in batch]
+            all_known = False
+            for page, url, response in zip(batch, urls, fetch_all(client, urls, concurrency)):
+                page_jobs = None
+                if isinstance(response, Exception):
+                    print(f"Error fetching page {page}: {str(response)}")
+                else:
+                    page_jobs = extract_http_page_jobs(response)
+
+                if page_jobs is None:
+                    # Needs JavaScript (or the fetch failed): render this page in a browser
+                    print(f"Page {page} needs a browser, falling back to Selenium")
+                    METRICS.count('fallbacks', kind='browser')
+                    if driver is None:
+                        driver = create_driver()
+                    page_jobs = scrape_page(driver, keyword, page, base_url)
+
+                new_jobs = [job_info for job_info in page_jobs if job_info.key() not in seen]
+                seen.update(job_info.key() for job_info in new_jobs)
+                jobs_added += len(new_jobs)
+                print(f"Page {page}: {len(page_jobs)} jobs, {jobs_added} unique so far")
+                if checkpoint:
+                    checkpoint.page_done(page, url, page_jobs)
+                all_known = store_page_jobs(store, page, page_jobs, keyword, known_pages)
+                yield from new_jobs
+                if all_known:
+                    print(f"The last {KNOWN_PAGES_TO_STOP} pages only had stored jobs, stopping")
+                    break
+            if all_known:
+                break
+        finished = True
+    except Exception as e:
+        print(f"Error during scraping: {str(e)}")
+    finally:
+        client.close()
+        if driver is not None:
+            driver.quit()
+        finish_selectors()
+        finish_checkpoint(checkpoint, finished)
+
+# Function to scrape pages over HTTP into a list
+def scrape_naukri_jobs_http(keyword, num_pages, concurrency=4, store=None, checkpoint=None, base_url=NAUKRI_URL):
+    return list(iter_naukri_jobs_http(keyword, num_pages, concurrency, store, checkpoint, base_url))
+
+# Function to scrape pages with the asyncio crawl scheduler: rate limited per host, backing off
+# when the site pushes back. The scheduler runs in a background thread and each page's jobs are
+# yielded as soon as it is fetched, so only pages the consumer hasn't reached yet are held.
+# Pages that need JavaScript, or that still fail after the scheduler's retries, are rendered
+# in a browser afterwards.
+def iter_naukri_jobs_crawler(keyword, num_pages, concurrency=4, rate_per_host=1.0, store=None, checkpoint=None,
+                             base_url=NAUKRI_URL):
+    client = HttpClient(connections_per_host=concurrency)
+    pages = [page for page in range(1, num_pages + 1) if not (checkpoint and checkpoint.is_done(page))]
+    fetched_pages = queue.Queue()
+    browser_pages = []
+    # Pages after a run of entirely known pages aren't needed
+    known_pages = KnownPageTracker()
+    driver = None
+    crawl_thread = None
+    crawl_errors = []
+    finished = False
+
+    # Listing stage: extract a fetched results page, save its jobs and hand them to the consumer
+    def listing_stage(response, request, scheduler):
+        page = request.meta['page']
+        page_jobs = extract_http_page_jobs(response)
+        if page_jobs is None:
+            browser_pages.append(page)
+            return
+        if checkpoint:
+            checkpoint.page_done(page, request.url, page_jobs)
+        if store_page_jobs(store, page, page_jobs, keyword, known_pages):
+            print(f"{KNOWN_PAGES_TO_STOP} pages in a row only had stored jobs, stopping the crawl")
+            scheduler.stop()
+        fetched_pages.put((page, page_jobs))
+
+    scheduler = CrawlScheduler(client, {'listing': listing_stage}, max_in_flight=concurrency,
+                               rate_per_host=rate_per_host)
+    for page in pages:
+        scheduler.add(build_page_url(keyword, page, base_url), 'listing', meta={'page': page})
+
+    def crawl():
+        try:
+            asyncio.run(scheduler.run())
+        except Exception as e:
+            crawl_errors.append(e)
+        finally:
+            fetched_pages.put(None)
+
+    resumed_jobs = list(checkpoint.jobs) if checkpoint else []
+    yield from resumed_jobs
+    seen = {job_info.key() for job_info in resumed_jobs}
+    jobs_added = len(resumed_jobs)
+
+    # Function to yield a page's jobs that weren't already yielded
+    def new_page_jobs(page, page_jobs):
+        nonlocal jobs_added
+        new_jobs = [job_info for job_info in page_jobs if job_info.key() not in seen]
+        seen.update(job_info.key() for job_info in new_jobs)
+        jobs_added += len(new_jobs)
+        print(f"Page {page}: {len(page_jobs)} jobs, {jobs_added} unique so far")
+        return new_jobs
+
+    try:
+        crawl_thread = threading.Thread(target=crawl, daemon=True)
+        crawl_thread.start()
+        for page, page_jobs in iter(fetched_pages.get, None):
+            yield from new_page_jobs(page, page_jobs)
+        crawl_thread.join()
+        if crawl_errors:
+            raise crawl_errors[0]
+        print(f"Crawler: {scheduler.stats['fetched']} pages fetched, {scheduler.stats['retries']} retries, "
+              f"{scheduler.stats['blocked']} blocked responses")
+        browser_pages.extend(request.meta['page'] for request in scheduler.failed)
+
+        for page in sorted(browser_pages):
+            if not known_pages.wanted(page):
+                continue
+            print(f"Page {page} needs a browser, falling back to Selenium")
+            METRICS.count('fallbacks', kind='browser')
+            if driver is None:
+                driver = create_driver()
+            page_jobs = scrape_page(driver, keyword, page, base_url)
+            if checkpoint:
+                checkpoint.page_done(page, driver.current_url, page_jobs)
+            store_page_jobs(store, page, page_jobs, keyword, known_pages)
+            yield from new_page_jobs(page, page_jobs)
+        finished = True
+    except Exception as e:
+        print(f"Error during scraping: {str(e)}")
+    finally:
+        if crawl_thread is not None and crawl_thread.is_alive():
+            # The consumer stopped early: let in-flight pages finish, drop the rest
+            scheduler.stop()
+            crawl_thread.join()
+        client.close()
+        if driver is not None:
+            driver.quit()
+        finish_selectors()
+        finish_checkpoint(checkpoint, finished)
+
+# Function to scrape pages with the crawl scheduler into a list
+def scrape_naukri_jobs_crawler(keyword, num_pages, concurrency=4, rate_per_host=1.0, store=None, checkpoint=None,
+                               base_url=NAUKRI_URL):
+    return list(iter_naukri_jobs_crawler(keyword, num_pages, concurrency, rate_per_host, store, checkpoint, base_url))
+
+# Function to scrape a range of pages in parallel with a pool of long-lived browsers.
+# Jobs are yielded in page order as soon as each page (and every page before it) is done.
+def iter_naukri_jobs_parallel(keyword, num_pages, num_workers=4, store=None, checkpoint=None):
+    pool = DriverPool(create_driver, num_workers)
+    # Workers skip every page after a run of entirely known pages
+    known_pages = KnownPageTracker()
+    failed_pages = []
+
+    def scrape_with_pool(page):
+        if not known_pages.wanted(page) or (checkpoint and checkpoint.is_done(page)):
+            return []
+        try:
+            with pool.session() as driver:
+                page_jobs = scrape_page(driver, keyword, page)
+                url = driver.current_url
+        except DriverStartError:
+            # Without a browser no page can be scraped; end the crawl instead of relaunching per page
+            known_pages.stop()
+            raise
+        except Exception as e:
+            print(f"Error scraping page {page}: {str(e)}")
+            failed_pages.append(page)
+            return []
+        if checkpoint:
+            checkpoint.page_done(page, url, page_jobs)
+        if store_page_jobs(store, page, page_jobs, keyword, known_pages):
+            print(f"{KNOWN_PAGES_TO_STOP} pages in a row up to page {known_pages.stop_after} only had stored jobs, "
+                  f"skipping later pages")
+        return page_jobs
+
+    # Jobs restored from a checkpoint come first; later repeats of a posting are dropped
+    resumed_jobs = list(checkpoint.jobs) if checkpoint else []
+    yield from resumed_jobs
+    seen = {job_info.key() for job_info in resumed_jobs}
+    jobs_added = len(resumed_jobs)
+    completed = False
+
+    try:
+        # Each worker takes the next unscraped page, so slow pages don't hold up the others
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            try:
+                for page, page_jobs in enumerate(executor.map(scrape_with_pool, range(1, num_pages + 1)), start=1):
+                    if not known_pages.wanted(page):
+                        break
+                    new_jobs = [job_info for job_info in page_jobs if job_info.key() not in seen]
+                    seen.update(job_info.key() for job_info in new_jobs)
+                    jobs_added += len(new_jobs)
+                    print(f"Page {page}: {len(page_jobs)} jobs, {jobs_added} unique so far")
+                    yield from new_jobs
+                completed = True
+            finally:
+                # If the consumer stops early, let queued pages return without scraping
+                known_pages.stop()
+    finally:
+        pool.close()
+        print_wait_summary()
+        finish_selectors()
+        finish_checkpoint(checkpoint, completed and not failed_pages)
+
+# Function to scrape pages in parallel into a list
+def scrape_naukri_jobs_parallel(keyword, num_pages, num_workers=4, store=None, checkpoint=None):
+    return list(iter_naukri_jobs_parallel(keyword, num_pages, num_workers, store, checkpoint))
+
+# Function to get the text of the first element matching an XPath under `element`, or None
+def first_element_text(element, selector):
+    elements = element.find_elements(By.XPATH, selector)
+    return elements[0].text.strip() if elements else None
 
 # Function to extract job information from a job element
+@METRICS.timed('extract_job', fine=True)
 def extract_job_info(job_element):
-    job_info = {'title': None, 'company': None, 'description': '', 'skills': []}
+    job_info = {'title': None, 'company': None, 'description': ''}
     
-    # Extract job title with different possible selectors
-    title_selectors = [
-        './/a[contains(@class, "title")]',
-        './/a[contains(@class, "jobTitle")]',
-        './/a[contains(@class, "jdTitle")]'
-    ]
-    
-    for selector in title_selectors:
-        try:
-            title_element = job_element.find_element(By.XPATH, selector)
-            job_info['title'] = title_element.text.strip()
-            if job_info['title']:
-                break
-        except:
-            continue
-    
-    # Extract company name
-    company_selectors = [
-        './/a[contains(@class, "companyName")]',
-        './/a[contains(@class, "company")]',
-        './/span[contains(@class, "subTitle")]',
-        './/div[contains(@class, "companyInfo")]'
-    ]
-    
-    for selector in company_selectors:
-        try:
-            company_element = job_element.find_element(By.XPATH, selector)
-            job_info['company'] = company_element.text.strip()
-            if job_info['company']:
-                break
-        except:
-            continue
+    # Extract job title and company name, trying the best-performing selectors first;
+    # find_elements returns an empty list on a miss instead of raising
+    job_info['title'] = SELECTORS.first('title', partial(first_element_text, job_element))
+    job_info['company'] = SELECTORS.first('company', partial(first_element_text, job_element))
     
     # Extract job description
     # First try to get it from the current element
@@ -145,289 +625,154 @@ def extract_job_info(job_element):
     # If we have a title but no description, try to click on the job to get more details
     if job_info['title'] and not job_info['description']:
         try:
+            # The element's parent is the WebDriver that found it
+            driver = job_element.parent
             title_element = job_element.find_element(By.XPATH, './/a[contains(@class, "title")]')
             title_element.click()
-            time.sleep(2)
             
-            # Try to get the description from the modal
+            # Try to get the description from the modal, waiting for whichever selector appears first
             desc_selectors = [
                 '//div[contains(@class, "dang-inner-html")]', 
                 '//div[contains(@class, "job-desc")]'
             ]
             
-            for selector in desc_selectors:
-                try:
-                    desc_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    job_info['description'] = desc_element.text
-                    break
-                except:
-                    continue
+            desc_element = wait_until(driver, any_element_present(By.XPATH, desc_selectors), 'description')
+            if desc_element:
+                job_info['description'] = desc_element.text
         except:
             pass
     
-    # Extract skills from the description
-    if job_info['description']:
-        job_info['skills'] = extract_skills(job_info['description'])
+    if not job_info['title']:
+        return None
     
-    return job_info if job_info['title'] else None
+    # Extract skills from the description once; the record carries them from here on
+    return JobRecord.from_description(job_info['title'], job_info['company'], job_info['description'])
 
-# Function to extract jobs from page text when structured extraction fails
-def extract_jobs_from_text(page_text):
-    job_info = []
-    
-    # Split the text into lines
-    lines = page_text.split('\n')
-    
-    # Look for job titles and company names patterns
+# Lines containing any of these (case-insensitively) start a new job in the page-text fallback
+TITLE_PATTERNS = ['data engineer', 'data scientist', 'analytics engineer']
+
+# Function to compile title patterns into one matcher, run against already-lowercased lines
+@lru_cache(maxsize=None)
+def compile_title_matcher(title_patterns):
+    if not title_patterns:
+        return lambda line: None
+    return re.compile('|'.join(re.escape(pattern.lower()) for pattern in title_patterns)).search
+
+# Function to split page text into (title, company, description) segments in a single pass.
+# A segment starts at each line matching the title matcher; the first short line after the
+# title is taken as the company, and every line from the title on goes into the description.
+def iter_text_segments(page_text, title_matcher):
     job_title = None
     company_name = None
-    job_description = ""
-    collecting_description = False
+    description_parts = []
     
-    for line in lines:
+    # Lowercase the whole page once; lowercasing never adds or removes newlines,
+    # so the lowered lines pair up with the original ones
+    for line, lowered in zip(page_text.split('\n'), page_text.lower().split('\n')):
         line = line.strip()
         if not line:
             continue
-            
-        # Check for common job title patterns related to data engineering
-        if any(keyword in line.lower() for keyword in ['data engineer', 'data scientist', 'analytics engineer']):
-            # If we were collecting a description, save the previous job
-            if job_title and collecting_description:
-                skills = extract_skills(job_description)
-                job_info.append({
-                    'title': job_title,
-                    'company': company_name if company_name else "Unknown",
-                    'description': job_description,
-                    'skills': skills
-                })
-            
-            # Start new job
+        
+        if title_matcher(lowered.strip()):
+            # Save the previous job before starting a new one
+            if job_title:
+                yield job_title, company_name, ' '.join(description_parts) + ' '
             job_title = line
             company_name = None
-            job_description = line + " "  # Start description with title
-            collecting_description = True
-            
-        # Look for company names or continue collecting description
-        elif collecting_description:
+            description_parts = [line]  # Start description with title
+        elif job_title:
             # The line after the job title is often the company name
             if not company_name and len(line) < 50:  # Company names are usually short
                 company_name = line
-            job_description += line + " "
+            description_parts.append(line)
     
     # Add the last job if we were collecting one
-    if job_title and collecting_description:
-        skills = extract_skills(job_description)
-        job_info.append({
-            'title': job_title,
-            'company': company_name if company_name else "Unknown",
-            'description': job_description,
-            'skills': skills
-        })
-    
-    return job_info
-
-# Function to navigate to the next page
-def click_next_page(driver):
-    # First scroll to the bottom to ensure navigation is visible
+    if job_title:
+        yield job_title, company_name, ' '.join(description_parts) + ' '
+
+# Function to extract jobs from page text when structured extraction fails.
+# title_patterns picks which lines start a job; the default finds data roles.
+@METRICS.timed('parse_page_text')
+def extract_jobs_from_text(page_text, title_patterns=TITLE_PATTERNS):
+    title_matcher = compile_title_matcher(tuple(title_patterns))
+    return [JobRecord.from_description(job_title, company_name if company_name else "Unknown", job_description)
+            for job_title, company_name, job_description in iter_text_segments(page_text, title_matcher)]
+
+# Next-page links and buttons, in the order they're tried
+NEXT_SELECTORS = [
+    "//a[contains(text(), 'Next')]",
+    "//a[contains(@class, 'fright')]",
+    "//a[contains(@class, 'pagination-next')]",
+    "//span[contains(text(), 'Next')]/parent::*",
+    "//div[contains(@class, 'pagination')]//a[contains(@class, 'fright')]"
+]
+
+# Pagination strategy: open the page's URL directly
+def goto_page_url(driver, keyword, page):
+    driver.get(build_page_url(keyword, page))
+    return True
+
+# Pagination strategy: click the "Next" link
+def click_next_button(driver, keyword, page):
+    # First scroll to the bottom to ensure navigation is visible, and wait until it renders
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-    time.sleep(2)
-    
-    # Try different methods to find and click next page button
-    next_selectors = [
-        "//a[contains(text(), 'Next')]",
-        "//a[contains(@class, 'fright')]",
-        "//a[contains(@class, 'pagination-next')]",
-        "//span[contains(text(), 'Next')]/parent::*",
-        "//div[contains(@class, 'pagination')]//a[contains(@class, 'fright')]"
-    ]
+    wait_until(driver, any_element_present(By.XPATH, NEXT_SELECTORS), 'pagination')
     
-    for selector in next_selectors:
-        try:
-            next_button = driver.find_element(By.XPATH, selector)
-            driver.execute_script("arguments[0].scrollIntoView(true);", next_button)
-            time.sleep(1)
-            # Try JavaScript click which is more reliable than Selenium click
-            driver.execute_script("arguments[0].click();", next_button)
-            print(f"Clicked next page button with selector: {selector}")
+    for selector in NEXT_SELECTORS:
+        next_buttons = driver.find_elements(By.XPATH, selector)
+        if next_buttons:
+            # JavaScript click is more reliable than Selenium click
+            driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", next_buttons[0])
             return True
-        except Exception as e:
-            print(f"Couldn't click with selector {selector}: {str(e)}")
-            continue
-    
-    # Try clicking on the next page number
-    try:
-        # Find the currently active page number
-        active_page_elements = driver.find_elements(By.XPATH, "//a[contains(@class, 'active') or contains(@class, 'selected')]")
-        if active_page_elements:
-            current_page_text = active_page_elements[0].text.strip()
-            try:
-                current_page = int(current_page_text)
-                next_page = current_page + 1
-                
-                # Find and click the next page number
-                next_page_button = driver.find_element(By.XPATH, f"//a[text()='{next_page}']")
-                driver.execute_script("arguments[0].scrollIntoView(true);", next_page_button)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", next_page_button)
-                print(f"Clicked page number {next_page}")
-                return True
-            except ValueError:
-                print(f"Could not convert current page text '{current_page_text}' to integer")
-    except Exception as e:
-        print(f"Error clicking next page number: {str(e)}")
-    
-    # Try another approach - direct URL modification
-    try:
-        current_url = driver.current_url
-        if "-" in current_url:
-            # Check if there's already a page parameter
-            if "page-" in current_url:
-                parts = current_url.split("page-")
-                before_page = parts[0]
-                after_page = parts[1] if len(parts) > 1 else ""
-                
-                # Extract current page number
-                if after_page:
-                    current_page = int(after_page.split("-")[0])
-                    next_page = current_page + 1
-                    
-                    # Construct new URL with incremented page number
-                    new_url = f"{before_page}page-{next_page}"
-                    if "-" in after_page:
-                        new_url += "-" + "-".join(after_page.split("-")[1:])
-                        
-                    driver.get(new_url)
-                    print(f"Navigated to next page via URL: {new_url}")
-                    return True
-            else:
-                # No page parameter yet, add page-2
-                new_url = current_url.rstrip("/") + "/page-2"
-                driver.get(new_url)
-                print(f"Navigated to page 2 via URL: {new_url}")
-                return True
-    except Exception as e:
-        print(f"Error with URL-based navigation: {str(e)}")
-    
-    # Last resort - try to simulate pressing the right arrow key
-    try:
-        body = driver.find_element(By.TAG_NAME, "body")
-        body.send_keys(Keys.RIGHT)
-        print("Tried navigating with RIGHT arrow key")
-        time.sleep(2)
-        # Check if URL changed to verify if this worked
-        return True
-    except:
-        pass
-    
-    print("All pagination methods failed")
     return False
 
+# Pagination strategy: click the link showing the page number
+def click_page_number(driver, keyword, page):
+    page_links = driver.find_elements(By.XPATH, f"//a[normalize-space(text())='{page}']")
+    if not page_links:
+        return False
+    driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", page_links[0])
+    return True
+
+# Pagination strategy: press the RIGHT arrow key, which some layouts bind to the next page
+def press_right_key(driver, keyword, page):
+    driver.find_element(By.TAG_NAME, "body").send_keys(Keys.RIGHT)
+    return True
+
+# Pagination strategies, cheapest first; the engine learns which one Naukri responds to
+PAGINATION_STRATEGIES = {
+    'url': goto_page_url,
+    'next_button': click_next_button,
+    'page_number': click_page_number,
+    'arrow_key': press_right_key,
+}
+
+# Where the pagination engine keeps the strategy it learned; benchmarks point it elsewhere
+PAGINATION_PATH = DEFAULT_STRATEGY_PATH
+
+# Function to create the pagination engine for Naukri result pages
+def create_pagination_engine():
+    return PaginationEngine('naukri.com', PAGINATION_STRATEGIES, extract_page_jobs, page_marker,
+                            wait_for_job_listings, path=PAGINATION_PATH)
+
 # Function to extract skills from text
 def extract_skills(text):
     if not text:
         return []
-        
-    # List of skills to look for, categorized
-    skill_categories = {
-    # Databases and Data Warehouses
-    'Databases': [
-        'PostgreSQL', 'Snowflake', 'Databricks', 'Redshift', 'BigQuery', 'MongoDB', 'MySQL', 
-        'Cassandra', 'DynamoDB', 'HBase', 'Neo4j', 'Elasticsearch', 'Dremio', 'Delta Lake','NoSQL','HDFS','Redis','S3'
-    ],
-    
-    # Streaming and Messaging Systems
-    'Streaming': [
-        'Kafka', 'Kinesis', 'PubSub', 'Pub/sub', 'Event Hub', 'RabbitMQ', 'Apache Pulsar'
-    ],
-    
-    # Orchestration and Workflow Management
-    'Orchestration': [
-        'Airflow', 'dbt', 'NiFi', 'Luigi', 'Dagster', 'Prefect', 'Kubernetes','Control-M','ADF'
-    ],
-    
-    # Data Integration and ETL Tools
-    'Data_Integration': [
-        'Fivetran', 'Stitch', 'Segment', 'Matillion', 'Alteryx', 'Informatica', 'Talend', 
-        'AWS Glue', 'Azure Data Factory', 'Google Cloud Dataflow'
-    ],
-    
-    # Data Governance and Security
-    'Data_Governance_and_Security': [
-        'Collibra', 'Denodo', 'Immuta', 'Apache Ranger', 'Privacera', 'Alation','Metadata Management','Data Catalog','Atlan'
-    ],
-    
-    # Query Engines and Data Lake Tools
-    'Query_Engines_and Data_Lake_Tools': [
-        'Presto', 'Starburst', 'Trino', 'Apache Drill'
-    ],
-    
-    # Visualization and BI Tools
-    'Visualization_and_BI_Tools': [
-        'PowerBI', 'Tableau', 'Looker', 'Qlik', 'Sisense', 'Superset'
-    ],
-    
-    # Programming Languages
-    'Programming_Languages': [
-        'Python', 'SQL', 'PySpark', 'Java', 'Scala', 'Rust', 'C++','Unix','Shell'
-    ],
-    
-    # Big Data Frameworks
-    'Big_Data_Frameworks': [
-        'Hadoop', 'Hive', 'Spark', 'Flink', 'Beam', 'Pig'
-    ],
-    
-    # Cloud Platforms and Services
-    'Cloud_Platforms_and_Services': [
-        'AWS', 'Azure', 'GCP', 'EMR', 'Dataproc', 'Synapse', 'Lambda', 'Step Functions'
-    ],
-    
-    # Machine Learning and AI Tools
-    'Machine_Learning_and_AI_Tools': [
-        'Machine Learning', 'AI', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'MLflow', 'Kubeflow'
-    ],
-    
-    # Data Concepts and Architectures
-    'Data_Concepts_and_Architectures': [
-        'ETL', 'ELT', 'Data Warehouse', 'Data Lake', 'Data Lakehouse', 'Big Data', 
-        'Data Modeling', 'Dimensional Modeling', 'Data Governance', 'Data Quality', 
-        'Data Lineage', 'Data Catalog', 'Data Mesh', 'Data Fabric', 'Serverless','Data Pipeline'
-    ],
-    
-    # DevOps and CI/CD Tools
-    'DevOps_and_CI/CD_Tools': [
-        'Docker', 'Kubernetes', 'Terraform', 'Jenkins', 'Git', 'GitHub Actions', 'CI/CD','Bitbucket','SVN'
-    ],
-    
-    # Soft Skills and Methodologies
-    'Soft_Skills_and_Methodologies': [
-        'Agile', 'Scrum', 'DevOps', 'Problem Solving', 'Collaboration', 'Documentation','Jira'
-    ]
-    ,'Concepts': ['Big Data', 'Machine Learning', 'AI', 'Data Modeling', 'Data Pipeline','ETL','ELT','ML','Data Warehouse','Unix','OLAP','OLTP']
-}
 
-    # Flatten the categories into a list of skills with their categories
-    skills_with_categories = []
-    for category, category_skills in skill_categories.items():
-        for skill in category_skills:
-            skills_with_categories.append((skill, category))
+    # Single pass over the text with the matcher compiled in skill_matcher
+    return match_skills(text)
 
-    # Extract skills from text with their categories
-    text = text.lower()
-    found_skills = []
-    for skill, category in skills_with_categories:
-        if skill.lower() in text:
-            found_skills.append((skill, category))
-    
-    # Extract just the skill names for the original function behavior
-    skills_list = [skill for skill, _ in found_skills]
-    
-    return skills_list, found_skills
+# Function to generate visualizations.
+# search_keyword is a display name like "data-engineer"; output files are named "{prefix}_...".
+# Charts are rendered by chart_render in worker processes; `processes=1` renders in this process.
+# With an OutputManifest, charts and CSVs whose data hasn't changed since the last run are left as they are.
+@METRICS.timed('visualize_skills')
+def generate_skill_visualizations(aggregator, search_keyword, prefix='data_engineer', processes=None, manifest=None):
+    skill_counts = aggregator.skill_counts
+    total_jobs = aggregator.total_jobs
+    title_keyword = search_keyword.replace("-", " ").title()
 
-# Function to generate visualizations
-def generate_skill_visualizations(skill_counts, total_jobs, search_keyword):
-    
     # Create output directory if it doesn't exist
     output_dir = 'skill_analysis'
     if not os.path.exists(output_dir):
@@ -437,122 +782,87 @@ def generate_skill_visualizations(skill_counts, total_jobs, search_keyword):
     df = pd.DataFrame(skill_counts.most_common(25), columns=['Skill', 'Count'])
     df['Percentage'] = df['Count'] / total_jobs * 100
     
-    # Create a horizontal bar chart for the top 25 skills
-    plt.figure(figsize=(14, 12))
-    bars = plt.barh(df['Skill'], df['Count'], color='skyblue')
-    plt.xlabel('Number of Job Listings')
-    plt.ylabel('Skills')
-    plt.title(f'Top 25 Skills for {search_keyword.replace("-", " ").title()} Jobs on Naukri.com')
-    
-    # Add count labels to the bars
-    for bar in bars:
-        width = bar.get_width()
-        plt.text(width + 0.3, bar.get_y() + bar.get_height()/2, f'{width:.0f}', 
-                 ha='left', va='center')
-    
-    plt.tight_layout()
-    bar_chart_path = f"{output_dir}/data_engineer_skills_bar_chart.png"
-    plt.savefig(bar_chart_path)
-    print(f"Bar chart saved to: {bar_chart_path}")
-    
-    # Create a pie chart for the top 10 skills
-    plt.figure(figsize=(12, 10))
+    # A horizontal bar chart for the top 25 skills and a pie chart for the top 10
+    bar_chart_path = f"{output_dir}/{prefix}_skills_bar_chart.png"
+    pie_chart_path = f"{output_dir}/{prefix}_skills_pie_chart.png"
     top10_df = df.head(10)
-    plt.pie(top10_df['Percentage'], labels=top10_df['Skill'], autopct='%1.1f%%', 
-            startangle=90, shadow=True, explode=[0.05]*len(top10_df))
-    plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-    plt.title(f'Top 10 Skills Distribution for {search_keyword.replace("-", " ").title()} Jobs')
-    
-    pie_chart_path = f"{output_dir}/data_engineer_skills_pie_chart.png"
-    plt.savefig(pie_chart_path)
-    print(f"Pie chart saved to: {pie_chart_path}")
+    rendered = render_charts([
+        bar_chart_spec(bar_chart_path, df['Skill'], df['Count'],
+                       f'Top 25 Skills for {title_keyword} Jobs on Naukri.com',
+                       'Number of Job Listings', 'Skills', 'skyblue', figsize=(14, 12)),
+        pie_chart_spec(pie_chart_path, top10_df['Skill'], top10_df['Percentage'],
+                       f'Top 10 Skills Distribution for {title_keyword} Jobs', explode=0.05),
+    ], processes, manifest)
+    if bar_chart_path in rendered:
+        print(f"Bar chart saved to: {bar_chart_path}")
+    if pie_chart_path in rendered:
+        print(f"Pie chart saved to: {pie_chart_path}")
     
     # Also save the data to CSV
-    csv_path = f"{output_dir}/data_engineer_skills_data.csv"
+    csv_path = f"{output_dir}/{prefix}_skills_data.csv"
     full_df = pd.DataFrame(skill_counts.most_common(), columns=['Skill', 'Count'])
     full_df['Percentage'] = full_df['Count'] / total_jobs * 100
-    full_df.to_csv(csv_path, index=False)
-    print(f"Skills data saved to: {csv_path}")
+    if write_csv_if_changed(full_df, csv_path, manifest):
+        print(f"Skills data saved to: {csv_path}")
     
     return bar_chart_path, pie_chart_path, csv_path
 
 # Function to generate category-based visualizations
-def generate_category_visualizations(skills_with_categories, total_jobs, search_keyword):
-    search_keyword = "data-engineer"
+@METRICS.timed('visualize_categories')
+def generate_category_visualizations(aggregator, search_keyword, prefix='data_engineer', processes=None, manifest=None):
+    total_jobs = aggregator.total_jobs
+    title_keyword = search_keyword.replace("-", " ").title()
     output_dir = 'skill_analysis'
     
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # Convert to DataFrame and group by category
-    df = pd.DataFrame(skills_with_categories, columns=['Skill', 'Category', 'Count'])
-    category_counts = df.groupby('Category')['Count'].sum().reset_index()
-    category_counts = category_counts.sort_values('Count', ascending=False)
+    # Convert the aggregated counters to DataFrames
+    df = pd.DataFrame(aggregator.skill_category_rows(), columns=['Skill', 'Category', 'Count'])
+    category_counts = pd.DataFrame(aggregator.category_counts.most_common(), columns=['Category', 'Count'])
     
     # Calculate percentages
     category_counts['Percentage'] = category_counts['Count'] / total_jobs * 100
     
-    # Create a bar chart for categories
-    plt.figure(figsize=(14, 10))
-    bars = plt.barh(category_counts['Category'], category_counts['Count'], color='lightgreen')
-    plt.xlabel('Number of Job Listings')
-    plt.ylabel('Skill Categories')
-    plt.title(f'Skill Categories for {search_keyword.replace("-", " ").title()} Jobs on Naukri.com')
-    
-    # Add count labels
-    for bar in bars:
-        width = bar.get_width()
-        plt.text(width + 0.3, bar.get_y() + bar.get_height()/2, f'{width:.0f}', 
-                 ha='left', va='center')
-    
-    plt.tight_layout()
-    category_chart_path = f"{output_dir}/data_engineer_categories_chart.png"
-    plt.savefig(category_chart_path)
-    print(f"Category chart saved to: {category_chart_path}")
-    
-    # Create a pie chart for categories
-    plt.figure(figsize=(12, 10))
-    plt.pie(category_counts['Percentage'], labels=category_counts['Category'], autopct='%1.1f%%', 
-            startangle=90, shadow=True, explode=[0.03]*len(category_counts))
-    plt.axis('equal')
-    plt.title(f'Skill Category Distribution for {search_keyword.replace("-", " ").title()} Jobs')
-    
-    category_pie_path = f"{output_dir}/data_engineer_categories_pie.png"
-    plt.savefig(category_pie_path)
-    print(f"Category pie chart saved to: {category_pie_path}")
-    
-    # Create individual charts for each category
-    for category in df['Category'].unique():
-        category_skills = df[df['Category'] == category].sort_values('Count', ascending=False)
-        if len(category_skills) > 0:
-            plt.figure(figsize=(12, 8))
-            bars = plt.barh(category_skills['Skill'], category_skills['Count'], color='orange')
-            plt.xlabel('Number of Job Listings')
-            plt.ylabel('Skills')
-            plt.title(f'{category} Skills for {search_keyword.replace("-", " ").title()} Jobs')
-            
-            # Add count labels
-            for bar in bars:
-                width = bar.get_width()
-                plt.text(width + 0.3, bar.get_y() + bar.get_height()/2, f'{width:.0f}', 
-                         ha='left', va='center')
-            
-            plt.tight_layout()
-            # Fix the path issue by replacing slashes with underscores in category name
-            category_filename = category.lower().replace(' ', '_').replace('/', '_')
-            skill_category_path = f"{output_dir}/data_engineer_{category_filename}_skills.png"
-            plt.savefig(skill_category_path)
-            print(f"{category} skills chart saved to: {skill_category_path}")
+    # A bar chart and a pie chart for categories
+    category_chart_path = f"{output_dir}/{prefix}_categories_chart.png"
+    category_pie_path = f"{output_dir}/{prefix}_categories_pie.png"
+    specs = [
+        bar_chart_spec(category_chart_path, category_counts['Category'], category_counts['Count'],
+                       f'Skill Categories for {title_keyword} Jobs on Naukri.com',
+                       'Number of Job Listings', 'Skill Categories', 'lightgreen', figsize=(14, 10)),
+        pie_chart_spec(category_pie_path, category_counts['Category'], category_counts['Percentage'],
+                       f'Skill Category Distribution for {title_keyword} Jobs', explode=0.03),
+    ]
+    
+    # Plus an individual chart for each category
+    for category, category_skills in df.groupby('Category', sort=False):
+        category_skills = category_skills.sort_values('Count', ascending=False)
+        # Fix the path issue by replacing slashes with underscores in category name
+        category_filename = category.lower().replace(' ', '_').replace('/', '_')
+        specs.append(bar_chart_spec(f"{output_dir}/{prefix}_{category_filename}_skills.png",
+                                    category_skills['Skill'], category_skills['Count'],
+                                    f'{category} Skills for {title_keyword} Jobs',
+                                    'Number of Job Listings', 'Skills', 'orange'))
+    
+    rendered = render_charts(specs, processes, manifest)
+    if category_chart_path in rendered:
+        print(f"Category chart saved to: {category_chart_path}")
+    if category_pie_path in rendered:
+        print(f"Category pie chart saved to: {category_pie_path}")
+    category_charts = len([path for path in rendered if path not in (category_chart_path, category_pie_path)])
+    if category_charts:
+        print(f"{category_charts} per-category skills charts saved to: {output_dir}/{prefix}_<category>_skills.png")
     
     # Save category data to CSV
-    csv_path = f"{output_dir}/data_engineer_categories_data.csv"
-    category_counts.to_csv(csv_path, index=False)
-    print(f"Category data saved to: {csv_path}")
+    csv_path = f"{output_dir}/{prefix}_categories_data.csv"
+    if write_csv_if_changed(category_counts, csv_path, manifest):
+        print(f"Category data saved to: {csv_path}")
     
     # Save detailed skills by category to CSV
-    detailed_csv_path = f"{output_dir}/data_engineer_skills_by_category.csv"
-    df.to_csv(detailed_csv_path, index=False)
-    print(f"Detailed skills by category saved to: {detailed_csv_path}")
+    detailed_csv_path = f"{output_dir}/{prefix}_skills_by_category.csv"
+    if write_csv_if_changed(df, detailed_csv_path, manifest):
+        print(f"Detailed skills by category saved to: {detailed_csv_path}")
     
     return category_chart_path, category_pie_path
 
@@ -615,47 +925,118 @@ def generate_mock_data():
         ('AI', 'Concepts', 35)
     ]
     
-    # Calculate all skills (just the skill names)
-    all_skills = [skill for skill, _, _ in mock_skills]
-    
     # Create job skill data
     job_details = []
     total_jobs = 100
     
-    # Create Counter for skills
-    skill_counts = Counter()
-    for skill, _, count in mock_skills:
-        skill_counts[skill] = count
+    # Load the pre-counted rows into an aggregator
+    aggregator = SkillAggregator.from_rows(mock_skills, total_jobs)
     
-    return job_details, all_skills, mock_skills, skill_counts, total_jobs
+    return job_details, aggregator
 
 # Main function
 if __name__ == "__main__":
     #keyword = "data-engineer-jobs-in-kolkata?k=data%20engineer&l=kolkata&experience=3&nignbevent_src=jobsearchDeskGNB"
     keyword = "data-engineer-jobs-in-india-data-engineer?k=data%20engineer&l=india%20data%20engineer&experience=3&nignbevent_src=jobsearchDeskGNB"  # Using Naukri URL format
+    search_name = "data-engineer"  # Used in chart titles and output file names
     num_pages = 100  # Number of pages to scrape
+    num_workers = 4  # Browsers scraping pages in parallel (1 = one browser clicking through pages)
+    fetch_backend = 'browser'  # 'browser' for Selenium, 'http' to fetch static pages without a browser,
+                               # 'crawler' for rate-limited HTTP fetching with backoff
+    requests_per_second = 1.0  # Per-host rate limit for the 'crawler' backend
+    near_duplicate_threshold = 0.8  # Postings at least this similar are counted as one
+    
+    parser = argparse.ArgumentParser(description="Scrape Naukri.com jobs and analyse the skills they ask for")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted crawl from its last checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=5,
+                        help="save crawl progress every N pages (default: 5)")
+    parser.add_argument('--export', choices=['parquet', 'arrow'],
+                        help="also write this run's jobs and skill matches to skill_analysis/export/ (needs pyarrow)")
+    parser.add_argument('--metrics', choices=['full', 'light', 'off'], default='full',
+                        help="run report detail: 'light' skips the per-job timers, 'off' records nothing (default: full)")
+    parser.add_argument('--prometheus', action='store_true',
+                        help="also write the run's metrics in Prometheus text format to skill_analysis/run_metrics.prom")
+    args = parser.parse_args()
+    METRICS.configure(args.metrics)
+    METRICS.reset()
     
     print(f"Searching for '{keyword}' jobs on Naukri.com")
+    # Remembers what each chart and CSV was built from, so unchanged ones aren't rewritten
+    manifest = OutputManifest()
     try:
-        job_details = scrape_naukri_jobs(keyword, num_pages)
+        os.makedirs('skill_analysis', exist_ok=True)
+        store = JobStore()
+        # Jobs are kept in the store, so the checkpoint only needs the page cursor
+        checkpoint = CrawlCheckpoint(keyword, every=args.checkpoint_every, keep_jobs=False)
+        if args.resume and not checkpoint.load():
+            print("No checkpoint to resume from, starting a new crawl")
+        if fetch_backend == 'crawler':
+            scraped = iter_naukri_jobs_crawler(keyword, num_pages, num_workers, requests_per_second,
+                                               store=store, checkpoint=checkpoint)
+        elif fetch_backend == 'http':
+            scraped = iter_naukri_jobs_http(keyword, num_pages, num_workers, store=store, checkpoint=checkpoint)
+        elif num_workers > 1:
+            scraped = iter_naukri_jobs_parallel(keyword, num_pages, num_workers, store=store, checkpoint=checkpoint)
+        else:
+            scraped = iter_naukri_jobs(keyword, num_pages, store=store, checkpoint=checkpoint)
         
-        print(f'\nTotal data engineer jobs analyzed: {len(job_details)}')
+        # Stream the crawl through the pipeline, flushing this run's counts every 100 jobs
+        run_aggregator = SkillAggregator()
+        flush_path = 'skill_analysis/data_engineer_skills_this_run.csv'
+        stages = [pipeline.match_skills]
+        exporter = ColumnarWriter(fmt=args.export) if args.export else None
+        if exporter:
+            # Export before the descriptions are dropped
+            stages.append(partial(pipeline.export_columnar, writer=exporter))
+        stages += [
+            pipeline.drop_descriptions,
+            partial(pipeline.aggregate, aggregator=run_aggregator, flush_every=100,
+                    on_flush=partial(pipeline.write_skill_counts, path=flush_path)),
+        ]
+        try:
+            with METRICS.stage('scrape'):
+                scraped_count = pipeline.run(scraped, *stages)
+        finally:
+            if exporter:
+                exporter.close()
+        print(f'\nScraped {scraped_count} jobs this run, {store.count(keyword)} unique jobs stored for this search')
         
-        if job_details:
-            # Collect all skills with their categories
-            all_skills = []
-            all_skills_with_categories = []
-            
-            for job in job_details:
-                # We need to extract skills again to get categories
-                skills_text = job.get('description', '')
-                if skills_text:
-                    skills_only, skills_with_cats = extract_skills(skills_text)
-                    all_skills.extend(skills_only)
-                    all_skills_with_categories.extend(skills_with_cats)
-            
-            if all_skills:
-                skill_counts = Counter(all_skills)
+        # Analyse every posting this search has found so far, not just the ones found on this run,
+        # streaming them out of the store rather than loading them all at once.
+        # Jobs other searches stored in the same database are left out.
+        # Reposts of the same job (by other recruiters, or with small edits) are counted once.
+        aggregator = SkillAggregator()
+        duplicate_report = DuplicateReport()
+        with METRICS.stage('analyse'):
+            pipeline.run(
+                store.iter_jobs(keyword=keyword),
+                partial(pipeline.drop_near_duplicates, index=NearDuplicateIndex(near_duplicate_threshold),
+                        report=duplicate_report),
+                pipeline.match_skills,
+                partial(pipeline.aggregate, aggregator=aggregator),
+            )
+        store.close()
+        print(duplicate_report.summary())
+        duplicate_report.save(manifest=manifest)
+        
+        print(f'\nTotal data engineer jobs analyzed: {aggregator.total_jobs}')
+        
+        # Keep a dated snapshot of what was listed on this run, so demand can be tracked across runs.
+        # The store's totals keep every posting ever seen, so they'd smooth trends away.
+        if run_aggregator.total_jobs:
+            history = SkillHistory()
+            history.record_run(run_aggregator, keyword)
+            rising, falling = history.trending(keyword=keyword)
+            history.close()
+            if len(rising) or len(falling):
+                print("\nSkill share trend over the last 4 weeks (percentage points per week):")
+                for skill, trend in pd.concat([rising, falling]).iterrows():
+                    print(f"{skill}: {trend['Slope']:+.1f} (now {trend['Latest share']:.1f}%)")
+        
+        if aggregator.total_jobs:
+            if aggregator.skill_counts:
+                skill_counts = aggregator.skill_counts
                 top_skills = skill_counts.most_common(25)
     
                 print("\nTop 10 skills for Data Engineers:")
@@ -664,15 +1045,10 @@ if __name__ == "__main__":
                 
                 # Print percentage of jobs requiring each skill
                 print("\nPercentage of jobs requiring each skill:")
-                total_jobs = len(job_details)
+                total_jobs = aggregator.total_jobs
                 for skill, count in top_skills:
                     percentage = (count / total_jobs) * 100
                     print(f'{skill}: {percentage:.1f}%')
-                    
-                # Process the skills with categories
-                category_skills_with_count = []
-                for skill, category in all_skills_with_categories:
-                    category_skills_with_count.append((skill, category, all_skills.count(skill)))
                 
                 # Generate visualizations
                 generate_visualizations = True
@@ -686,17 +1062,18 @@ if __name__ == "__main__":
         # If real scraping failed or had no results, use mock data
         if not generate_visualizations:
             print("\nUsing sample data to demonstrate visualizations")
-            _, all_skills, category_skills_with_count, skill_counts, total_jobs = generate_mock_data()
+            _, aggregator = generate_mock_data()
             generate_visualizations = True
             
         # Generate and save visualizations
         if generate_visualizations:
             print("\nGenerating visualizations...")
-            bar_chart, pie_chart, csv_file = generate_skill_visualizations(skill_counts, total_jobs, keyword)
+            bar_chart, pie_chart, csv_file = generate_skill_visualizations(aggregator, search_name, manifest=manifest)
             
             # Generate category visualizations
             print("\nGenerating category-based visualizations...")
-            category_chart, category_pie = generate_category_visualizations(category_skills_with_count, total_jobs, keyword)
+            category_chart, category_pie = generate_category_visualizations(aggregator, search_name, manifest=manifest)
+            manifest.save()
             
             print(f"\nAnalysis complete! Visual reports have been saved to the 'skill_analysis' directory.")
             print(f"- Bar chart: {bar_chart}")
@@ -708,19 +1085,27 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"An error occurred during execution: {str(e)}")
         print("\nUsing sample data to demonstrate visualizations instead")
-        job_details, all_skills, category_skills_with_count, skill_counts, total_jobs = generate_mock_data()
+        _, aggregator = generate_mock_data()
             
         # Generate and save visualizations
         print("\nGenerating visualizations...")
-        bar_chart, pie_chart, csv_file = generate_skill_visualizations(skill_counts, total_jobs, keyword)
+        bar_chart, pie_chart, csv_file = generate_skill_visualizations(aggregator, search_name, manifest=manifest)
         
         # Generate category visualizations
         print("\nGenerating category-based visualizations...")
-        category_chart, category_pie = generate_category_visualizations(category_skills_with_count, total_jobs, keyword)
+        category_chart, category_pie = generate_category_visualizations(aggregator, search_name, manifest=manifest)
+        manifest.save()
         
         print(f"\nAnalysis complete! Visual reports have been saved to the 'skill_analysis' directory.")
         print(f"- Bar chart: {bar_chart}")
         print(f"- Pie chart: {pie_chart}")
         print(f"- CSV data: {csv_file}")
         print(f"- Category chart: {category_chart}")
-        print(f"- Category pie chart: {category_pie}") 
\ No newline at end of file
+        print(f"- Category pie chart: {category_pie}") 
+    
+    # Where the run spent its time: a JSON run report, plus Prometheus text format if asked for
+    if METRICS.enabled:
+        METRICS.print_summary()
+        METRICS.save()
+        if args.prometheus:
+            METRICS.save_prometheus()
@@ -0,0 +1,139 @@
+import csv
+import io
+import os
+import re
+import zlib
+
+import numpy as np
+
+from output_manifest import write_text_if_changed
+
+DEFAULT_REPORT_PATH = 'skill_analysis/near_duplicates.csv'
+
+# Hash family for MinHash: h(x) = (a * x + b) mod p, truncated to 32 bits
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+# Function to turn a posting into a set of word shingles (3-word windows) over title, company and description
+def shingles(title, company, description, size=3):
+    words = WORD_PATTERN.findall(' '.join([title or '', company or '', description or '']).lower())
+    if len(words) < size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+# Function to pick the LSH bands x rows split for a similarity threshold, weighing the
+# chance of missing a true duplicate the same as the chance of comparing a false one
+def optimal_bands(threshold, num_perm):
+    similarities = np.linspace(0, 1, 201)
+    step = similarities[1]
+    best = None
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        candidate = 1 - (1 - similarities ** rows) ** bands
+        below = similarities <= threshold
+        false_positive = candidate[below].sum() * step
+        false_negative = (1 - candidate[~below]).sum() * step
+        error = false_positive + false_negative
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+# An index of job postings for finding near-duplicates with MinHash + LSH.
+#
+# Each posting is reduced to a `num_perm`-value MinHash signature of its
+# shingles; two signatures agree in a position with probability equal to the
+# postings' Jaccard similarity. Signatures are cut into bands and every band
+# is hashed into a bucket, so looking up a new posting only compares it with
+# the few postings sharing a bucket instead of the whole history.
+# Candidates count as duplicates when their estimated similarity is at least
+# `threshold`.
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.8, num_perm=128, seed=1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._buckets = [{} for _ in range(self.bands)]
+        self._signatures = {}
+
+    # Function to compute the MinHash signature of a set of shingles
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        # uint64 arithmetic wraps around, which only adds noise to an already random hash
+        permuted = (np.outer(hashes, self._a) + self._b) % MERSENNE_PRIME & MAX_HASH
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    # Function to find the most similar indexed posting; returns (key, similarity) or (None, 0.0)
+    def query(self, signature):
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(band_key, ()))
+        best_key, best_similarity = None, 0.0
+        for key in candidates:
+            similarity = float(np.mean(self._signatures[key] == signature))
+            if similarity > best_similarity:
+                best_key, best_similarity = key, similarity
+        if best_similarity >= self.threshold:
+            return best_key, best_similarity
+        return None, 0.0
+
+    # Function to add a posting's signature to the index under `key`
+    def add(self, key, signature):
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, []).append(key)
+
+    # Function to check a job against everything indexed so far and index it if it's new.
+    # Returns the key of the posting it duplicates with the similarity, or (None, 0.0).
+    # A posting with no words has nothing to compare, so it's never a duplicate and isn't indexed.
+    def check_and_add(self, job):
+        shingle_set = shingles(job.title, job.company, job.description)
+        if not shingle_set:
+            return None, 0.0
+        signature = self.signature(shingle_set)
+        duplicate_of, similarity = self.query(signature)
+        if duplicate_of is None:
+            self.add(job.key(), signature)
+        return duplicate_of, similarity
+
+    def __len__(self):
+        return len(self._signatures)
+
+
+# The postings a dedupe pass dropped, and which kept posting each one duplicated
+class DuplicateReport:
+    def __init__(self):
+        self.checked = 0
+        self.dropped = []
+
+    def record(self, job, duplicate_of, similarity):
+        self.dropped.append((job.key(), job.title, job.company, duplicate_of, similarity))
+
+    def summary(self):
+        return f"{len(self.dropped)} near-duplicate postings dropped out of {self.checked} checked"
+
+    # Function to write the dropped postings to CSV, unless an OutputManifest shows it's unchanged
+    def save(self, path=DEFAULT_REPORT_PATH, manifest=None):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        csv_text = io.StringIO()
+        writer = csv.writer(csv_text)
+        writer.writerow(['Job ID', 'Title', 'Company', 'Duplicate Of', 'Similarity'])
+        for job_id, title, company, duplicate_of, similarity in self.dropped:
+            writer.writerow([job_id, title, company, duplicate_of, f"{similarity:.2f}"])
+        if write_text_if_changed(csv_text.getvalue(), path, manifest):
+            print(f"Near-duplicate report saved to: {path}")
+        else:
+            print(f"Near-duplicate report unchanged: {path}")
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+DEFAULT_MANIFEST_PATH = 'skill_analysis/manifest.json'
+
+
+# Function to hash the data an artifact is built from.
+# `data` is anything JSON-serialisable (a chart spec, CSV text); key order doesn't matter.
+def hash_data(data):
+    encoded = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# A record of which input data every output file in skill_analysis/ was built from.
+#
+# Each artifact path maps to the hash of its inputs. Before writing a chart
+# or CSV, callers check is_current(); if the file exists and its inputs hash
+# the same as last time, the file is left alone. The manifest is saved with
+# a temp file + rename, like the crawl checkpoint.
+class OutputManifest:
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f).get('artifacts', {})
+
+    # Function to tell whether an artifact exists and was built from data with this hash
+    def is_current(self, artifact_path, data_hash):
+        entry = self.entries.get(artifact_path)
+        return entry is not None and entry['hash'] == data_hash and os.path.exists(artifact_path)
+
+    # Function to note that an artifact was just written from data with this hash
+    def record(self, artifact_path, data_hash):
+        self.entries[artifact_path] = {'hash': data_hash, 'written_at': datetime.now().isoformat(timespec='seconds')}
+
+    # Function to write the manifest atomically
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'artifacts': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+
+# Function to write text to a file unless the file already holds exactly this text.
+# Returns True if the file was written.
+def write_text_if_changed(text, path, manifest=None):
+    data_hash = hash_data(text)
+    if manifest is not None and manifest.is_current(path, data_hash):
+        return False
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+    if manifest is not None:
+        manifest.record(path, data_hash)
+    return True
+
+
+# Function to write a DataFrame to CSV unless the file already holds exactly this data.
+# Returns True if the file was written.
+def write_csv_if_changed(df, path, manifest=None):
+    return write_text_if_changed(df.to_csv(index=False), path, manifest)
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from urllib.parse import urlsplit
+
+from http_fetch import QuietFileHandler, serve_directory
+
+DEFAULT_CORPUS_DIR = 'benchmarks/fixtures/pages'
+INDEX_FILE = 'index.json'
+
+# Pages are saved already rendered, so their scripts must not run again on replay,
+# and stylesheets, frames and images would be fetched from the live sites' CDNs
+FREEZE_PATTERNS = [
+    re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL),
+    re.compile(r'<(?:link|iframe)\b[^>]*>', re.IGNORECASE),
+    re.compile(r'\s(?:src|srcset)\s*=\s*(["\']).*?\1', re.IGNORECASE | re.DOTALL),
+]
+
+
+# Function to get the "path?query" part of a URL, which is what the replay server looks pages up by
+def path_key(url):
+    parts = urlsplit(url)
+    return (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+
+# Function to make a rendered page safe to replay offline: drop scripts and external
+# resources, and turn absolute links into the recorded site into root-relative ones,
+# so following them stays on the replay server
+def freeze_html(html, host):
+    for pattern in FREEZE_PATTERNS:
+        html = pattern.sub('', html)
+    domain = '.'.join(host.split('.')[-2:])
+    site_links = re.compile(rf'https?://(?:[a-z0-9-]+\.)*{re.escape(domain)}(?=[/"\'?#])', re.IGNORECASE)
+    return site_links.sub('', html)
+
+
+# A directory of recorded pages: one HTML file per page plus an index.json that
+# maps each original URL to its file, page kind ('listing' or 'detail') and
+# recording time. A page can be indexed under more than one URL, e.g. the URL
+# the scraper asked for and the one the site redirected to. Safe to share
+# between threads.
+class PageCorpus:
+    def __init__(self, directory=DEFAULT_CORPUS_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.pages = {}
+        self.served = Counter()
+        self.missing = Counter()
+        self._by_path = None
+        self._lock = threading.Lock()
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.pages = json.load(f)
+
+    # Function to save a page's HTML under `url`, and under each alias not recorded yet
+    def add(self, url, html, kind, aliases=()):
+        host = urlsplit(url).hostname or 'local'
+        file_name = f"{host}/{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}.html"
+        path = os.path.join(self.directory, file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(freeze_html(html, host))
+        os.replace(temp_path, path)
+
+        entry = {'file': file_name, 'kind': kind, 'recorded_at': datetime.now().isoformat(timespec='seconds')}
+        with self._lock:
+            self.pages[url] = entry
+            for alias in aliases:
+                self.pages.setdefault(alias, entry)
+            self._by_path = None
+
+    # Function to list the recorded URLs, optionally only those of one kind
+    def urls(self, kind=None):
+        with self._lock:
+            return [url for url, entry in self.pages.items() if kind is None or entry['kind'] == kind]
+
+    # Function to find the page recorded for a request path ("path?query"), ignoring the host.
+    # Falls back to a page with the same path but another query string. Returns the index entry or None.
+    def find(self, request_path):
+        with self._lock:
+            if self._by_path is None:
+                self._by_path = {}
+                for url, entry in self.pages.items():
+                    self._by_path.setdefault(path_key(url), entry)
+                    self._by_path.setdefault(urlsplit(url).path or '/', entry)
+            entry = self._by_path.get(request_path) or self._by_path.get(request_path.partition('?')[0])
+            if entry:
+                self.served[entry['kind']] += 1
+            else:
+                self.missing[request_path] += 1
+            return entry
+
+    # Function to save the index atomically
+    def save(self):
+        with self._lock:
+            pages = dict(self.pages)
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(pages, f, indent=1)
+        os.replace(temp_path, self.index_path)
+
+
+# Serves recorded pages by the path and query the browser asks for; anything else is a 404
+class ReplayHandler(QuietFileHandler):
+    extensions_map = dict(QuietFileHandler.extensions_map, **{'.html': 'text/html; charset=utf-8'})
+
+    def __init__(self, *args, corpus=None, **kwargs):
+        self.corpus = corpus
+        super().__init__(*args, **kwargs)
+
+    def translate_path(self, path):
+        entry = self.corpus.find(path)
+        if entry is None:
+            return os.path.join(self.directory, 'missing', 'page.html')
+        return os.path.join(self.directory, entry['file'])
+
+
+# Records the pages a scrape renders, or replays them from a local server.
+#
+# The scrapers call capture() once a page has rendered (and capture_html() for
+# pages fetched over plain HTTP); it does nothing unless record() was called,
+# so normal runs pay nothing for it. Drivers pass through wrap_driver() when
+# they are created. While recording, it remembers the URL each driver was
+# asked to open, so pages are indexed under it as well as under the final URL.
+# While replaying, it points every driver.get() at the replay server and
+# counts WebDriver round trips. Only browser-driven fetching is redirected;
+# the plain-HTTP backends still go to the live sites.
+class PageReplay:
+    def __init__(self):
+        self.corpus = None
+        self.recording = False
+        self.server = None
+        self.base_url = None
+        self.round_trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def replaying(self):
+        return self.server is not None
+
+    # Function to start saving captured pages into a corpus directory
+    def record(self, directory=DEFAULT_CORPUS_DIR):
+        self.corpus = PageCorpus(directory)
+        self.recording = True
+        print(f"Recording pages into: {directory}")
+
+    # Function to start serving a recorded corpus; drivers created from now on load pages from it
+    def replay(self, directory=DEFAULT_CORPUS_DIR, port=0):
+        self.corpus = PageCorpus(directory)
+        if not self.corpus.pages:
+            raise ValueError(f"No recorded pages in {directory}; record some first")
+        self.server, self.base_url = serve_directory(directory, port,
+                                                     handler=partial(ReplayHandler, corpus=self.corpus))
+        self.round_trips = 0
+        print(f"Replaying {len(self.corpus.pages)} recorded pages from {directory} at {self.base_url}")
+
+    # Function to stop recording (saving the index) or replaying
+    def stop(self):
+        if self.recording:
+            self.corpus.save()
+            print(f"Recorded {len(self.corpus.pages)} page URLs in: {self.corpus.directory}")
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.recording = False
+        self.server = None
+        self.base_url = None
+
+    # Function to map a live URL to the same path and query on the replay server
+    def local_url(self, url):
+        if not self.replaying or url.startswith(self.base_url) or not url.startswith(('http://', 'https://')):
+            return url
+        return self.base_url + path_key(url)
+
+    # Function to hook a newly created WebDriver into recording or replay; returns the driver
+    def wrap_driver(self, driver):
+        get, execute = driver.get, driver.execute
+        if self.recording:
+            def recording_get(url):
+                driver.replay_requested_url = url
+                return get(url)
+            driver.get = recording_get
+        elif self.replaying:
+            def counting_execute(*args, **kwargs):
+                with self._lock:
+                    self.round_trips += 1
+                return execute(*args, **kwargs)
+            driver.execute = counting_execute
+            driver.get = lambda url: get(self.local_url(url))
+        return driver
+
+    # Function to save the page a driver is showing, as rendered
+    def capture(self, driver, kind):
+        if not self.recording:
+            return
+        try:
+            url, html = driver.current_url, driver.page_source
+        except Exception as e:
+            print(f"Couldn't record page: {str(e)}")
+            return
+        requested = getattr(driver, 'replay_requested_url', None)
+        self.corpus.add(url, html, kind, aliases=[requested] if requested else [])
+
+    # Function to save a page fetched without a browser
+    def capture_html(self, url, html, kind):
+        if self.recording:
+            self.corpus.add(url, html, kind)
+
+
+# Shared recorder used by the scrapers
+PAGES = PageReplay()
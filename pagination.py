@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from datetime import datetime
+
+from metrics import METRICS
+from waits import page_changed, wait_until
+
+DEFAULT_STRATEGY_PATH = 'skill_analysis/pagination.json'
+
+
+# Moves a browser from one results page to the next, learning which way works.
+#
+# `strategies` is an ordered dict of name -> function(driver, keyword, page)
+# that tries to open results page `page` and returns False if it couldn't
+# even attempt it. The first transition of a run tries them in order; a
+# strategy only counts as working once the new page is verified to show
+# jobs that weren't on any earlier page. The winner is used for every later
+# transition (others are only tried again if it stops working) and is saved
+# per site, so the next run starts with it.
+class PaginationEngine:
+    def __init__(self, site, strategies, extract_jobs, page_marker, wait_for_listings,
+                 path=DEFAULT_STRATEGY_PATH):
+        self.site = site
+        self.strategies = strategies
+        self.extract_jobs = extract_jobs
+        self.page_marker = page_marker
+        self.wait_for_listings = wait_for_listings
+        self.path = path
+        self.seen_keys = set()
+        self.strategy = self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding='utf-8') as f:
+            strategy = json.load(f).get(self.site, {}).get('strategy')
+        if strategy in self.strategies:
+            print(f"Using saved pagination strategy for {self.site}: {strategy}")
+            return strategy
+        return None
+
+    # Function to save the winning strategy for this site, keeping other sites' entries
+    def _save(self):
+        saved = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+        saved[self.site] = {'strategy': self.strategy, 'learned_at': datetime.now().isoformat(timespec='seconds')}
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(saved, f, indent=1)
+        os.replace(temp_path, self.path)
+
+    # Function to note the jobs of a page the browser is on, so later pages can be verified against them
+    def page_loaded(self, page_jobs):
+        self.seen_keys.update(job.key() for job in page_jobs)
+
+    # Function to open page `page` and extract its jobs.
+    # Returns the page's jobs, or None if no strategy produced a page with new jobs.
+    # Every strategy after the first one tried counts as a pagination fallback.
+    @METRICS.timed('paginate')
+    def advance(self, driver, keyword, page):
+        order = list(self.strategies)
+        if self.strategy:
+            order.remove(self.strategy)
+            order.insert(0, self.strategy)
+
+        for attempt, name in enumerate(order):
+            if attempt:
+                METRICS.count('fallbacks', kind='pagination')
+            old_url, old_marker = driver.current_url, self.page_marker(driver)
+            start = time.perf_counter()
+            try:
+                if not self.strategies[name](driver, keyword, page):
+                    continue
+            except Exception as e:
+                print(f"Pagination strategy {name} failed: {str(e)}")
+                continue
+            wait_until(driver, page_changed(old_url, old_marker, self.page_marker), 'page_change')
+            self.wait_for_listings(driver)
+            METRICS.observe('page_load_seconds', time.perf_counter() - start, via=name)
+
+            page_jobs = self.extract_jobs(driver)
+            keys = {job.key() for job in page_jobs}
+            if not keys - self.seen_keys:
+                print(f"Pagination strategy {name} didn't reach a page with new jobs")
+                continue
+
+            if name != self.strategy:
+                print(f"Pagination strategy for {self.site}: {name}")
+                self.strategy = name
+                self._save()
+            self.page_loaded(page_jobs)
+            return page_jobs
+
+        print("All pagination strategies failed")
+        return None
@@ -0,0 +1,87 @@
+import csv
+import os
+from dataclasses import replace
+from functools import reduce
+
+# Composable stages for the scrape -> match skills -> aggregate -> sink pipeline.
+#
+# Every stage takes an iterable of JobRecord objects and yields them on, so a
+# pipeline is just nested generators and only the job currently being
+# processed is held in memory, however many pages the crawl covers.
+
+
+# Stage: drop postings that are near-duplicates of one earlier in the stream (or already in the
+# near_duplicates.NearDuplicateIndex), recording every drop in a DuplicateReport if given
+def drop_near_duplicates(jobs, index, report=None):
+    for job in jobs:
+        duplicate_of, similarity = index.check_and_add(job)
+        if report is not None:
+            report.checked += 1
+            if duplicate_of is not None:
+                report.record(job, duplicate_of, similarity)
+        if duplicate_of is None:
+            yield job
+
+
+# Stage: make sure every job has its skills matched (jobs loaded from old data may not)
+def match_skills(jobs):
+    for job in jobs:
+        if job.description and not job.skills:
+            job.rematch()
+        yield job
+
+
+# Stage: write each job and its skill matches to a columnar_export.ColumnarWriter
+def export_columnar(jobs, writer):
+    for job in jobs:
+        writer.add(job)
+        yield job
+
+
+# Stage: add each job to a SkillAggregator, calling on_flush(aggregator) every `flush_every` jobs
+def aggregate(jobs, aggregator, flush_every=None, on_flush=None):
+    for job in jobs:
+        aggregator.add_job(job.skills, job.skill_categories)
+        if flush_every and on_flush and aggregator.total_jobs % flush_every == 0:
+            on_flush(aggregator)
+        yield job
+
+
+# Stage: drop the description text once skills have been matched, so nothing downstream keeps it.
+# Yields copies, leaving the scraper's own records (e.g. those a CrawlCheckpoint keeps) untouched.
+def drop_descriptions(jobs):
+    for job in jobs:
+        yield replace(job, description='')
+
+
+# Function to chain stages onto a source: run(source, a, b) is b(a(source))
+def chain(source, *stages):
+    return reduce(lambda jobs, stage: stage(jobs), stages, source)
+
+
+# Function to run a pipeline to completion; returns how many jobs came out of the last stage.
+# If a stage raises, a generator source is closed straight away, so its cleanup (quitting
+# browsers, saving the crawl checkpoint) runs now rather than whenever it's garbage collected.
+def run(source, *stages):
+    count = 0
+    try:
+        for _ in chain(source, *stages):
+            count += 1
+    finally:
+        close = getattr(source, 'close', None)
+        if close is not None:
+            close()
+    return count
+
+
+# Function to write the aggregator's current skill counts to a CSV, e.g. as a flush callback
+def write_skill_counts(aggregator, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Skill', 'Count', 'Percentage'])
+        for skill, count in aggregator.skill_counts.most_common():
+            writer.writerow([skill, count, count / aggregator.total_jobs * 100])
+    os.replace(temp_path, path)
+    print(f"Flushed counts for {aggregator.total_jobs} jobs to: {path}")
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+
+from metrics import METRICS
+
+DEFAULT_STATS_PATH = 'skill_analysis/selector_stats.json'
+
+
+# Keeps fallback selector lists in the order that works best.
+#
+# Each group ('job', 'title', 'company', ...) is a list of alternative
+# selectors. Hits and misses are counted per selector; as soon as a selector
+# hits, it moves to the front of its group for the rest of the run, so later
+# lookups stop paying for the misses in front of it. Counts are saved between
+# runs and a group starts each run in hit-rate order. report() lists the hit
+# rates and warns about groups where every selector failed this run, which
+# usually means the site's layout changed. Safe to share between threads.
+class SelectorRegistry:
+    def __init__(self, path=DEFAULT_STATS_PATH):
+        self.path = path
+        self._groups = {}
+        self._stats = {}
+        self._run = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._stats = json.load(f)
+
+    def _counts(self, group, selector):
+        return self._stats.setdefault(group, {}).setdefault(selector, {'hits': 0, 'misses': 0})
+
+    @staticmethod
+    def _hit_rate(counts):
+        total = counts['hits'] + counts['misses']
+        return counts['hits'] / total if total else 0.0
+
+    # Function to add a group of selectors, ordered by their saved hit rates (ties keep the given order)
+    def register(self, group, selectors):
+        with self._lock:
+            saved = self._stats.get(group, {})
+            self._groups[group] = sorted(
+                selectors, key=lambda selector: -self._hit_rate(saved.get(selector, {'hits': 0, 'misses': 0})))
+            self._run[group] = {'lookups': 0, 'failed': 0}
+
+    # Function to get a group's selectors in the order they should be tried
+    def ordered(self, group):
+        with self._lock:
+            return list(self._groups[group])
+
+    # Function to count a hit or a miss for a selector; a hit promotes it to the front of its group
+    def record(self, group, selector, hit):
+        if not hit:
+            METRICS.count('selector_misses', group=group)
+        with self._lock:
+            counts = self._counts(group, selector)
+            counts['hits' if hit else 'misses'] += 1
+            if hit and self._groups[group][0] != selector:
+                self._groups[group].remove(selector)
+                self._groups[group].insert(0, selector)
+
+    # Function to count a lookup that went through the whole group, and whether anything matched
+    def record_lookup(self, group, found):
+        if not found:
+            METRICS.count('selector_failures', group=group)
+        with self._lock:
+            self._run[group]['lookups'] += 1
+            if not found:
+                self._run[group]['failed'] += 1
+
+    # Function to record the outcome of a lookup done elsewhere (e.g. in the browser's batch script),
+    # which tried `selectors` in order and stopped at `matched` (None if nothing matched)
+    def record_match(self, group, selectors, matched):
+        for selector in selectors:
+            self.record(group, selector, selector == matched)
+            if selector == matched:
+                break
+        self.record_lookup(group, matched is not None)
+
+    # Function to try a group's selectors in order with lookup(selector), returning the first
+    # truthy result (or None), and counting every hit and miss along the way
+    def first(self, group, lookup):
+        for selector in self.ordered(group):
+            try:
+                result = lookup(selector)
+            except Exception:
+                result = None
+            self.record(group, selector, bool(result))
+            if result:
+                self.record_lookup(group, True)
+                return result
+        self.record_lookup(group, False)
+        return None
+
+    # Function to save the hit counts atomically
+    def save(self):
+        with self._lock:
+            stats = json.loads(json.dumps(self._stats))
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=1)
+        os.replace(temp_path, self.path)
+
+    # Function to print each group's hit rates and flag groups where every selector failed this run
+    def report(self):
+        with self._lock:
+            groups = {group: list(selectors) for group, selectors in self._groups.items()}
+            run = {group: dict(counts) for group, counts in self._run.items()}
+        if not any(counts['lookups'] for counts in run.values()):
+            return
+        print("\nSelector hit rates:")
+        for group, selectors in groups.items():
+            lookups, failed = run[group]['lookups'], run[group]['failed']
+            if not lookups:
+                continue
+            print(f"  {group}: {lookups - failed}/{lookups} lookups matched")
+            for selector in selectors:
+                counts = self._counts(group, selector)
+                print(f"    {self._hit_rate(counts):6.1%}  {selector}")
+            if failed == lookups:
+                print(f"  WARNING: none of the {len(selectors)} {group} selectors matched this run; "
+                      f"the site layout may have changed")
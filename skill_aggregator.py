@@ -0,0 +1,49 @@
+from collections import Counter
+
+
+# Running skill counts for a crawl.
+#
+# Jobs are added one at a time as they are scraped; each add is O(number of
+# skills in that job), so the totals never need to be recomputed from the
+# full list of hits. The visualisation functions read the counters directly.
+class SkillAggregator:
+    def __init__(self):
+        self.total_jobs = 0
+        self.skill_counts = Counter()
+        self.category_counts = Counter()
+        self.skill_category_counts = Counter()
+
+    # Function to add the extract_skills output of one job
+    def add_job(self, skills_list, found_skills):
+        self.total_jobs += 1
+        self.skill_counts.update(skills_list)
+        for skill, category in found_skills:
+            self.category_counts[category] += 1
+            self.skill_category_counts[(skill, category)] += 1
+
+    # Function to add counts that were aggregated elsewhere, e.g. mock data
+    def add_counts(self, skill_category_rows, total_jobs):
+        self.total_jobs += total_jobs
+        for skill, category, count in skill_category_rows:
+            self.skill_counts[skill] = max(self.skill_counts[skill], count)
+            self.category_counts[category] += count
+            self.skill_category_counts[(skill, category)] += count
+
+    # Function to merge another aggregator into this one
+    def merge(self, other):
+        self.total_jobs += other.total_jobs
+        self.skill_counts.update(other.skill_counts)
+        self.category_counts.update(other.category_counts)
+        self.skill_category_counts.update(other.skill_category_counts)
+
+    # One (skill, category, count) row per pair, most common first
+    def skill_category_rows(self):
+        return [(skill, category, count)
+                for (skill, category), count in self.skill_category_counts.most_common()]
+
+    # Function to create an aggregator from pre-counted rows
+    @classmethod
+    def from_rows(cls, skill_category_rows, total_jobs):
+        aggregator = cls()
+        aggregator.add_counts(skill_category_rows, total_jobs)
+        return aggregator
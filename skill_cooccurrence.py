@@ -0,0 +1,129 @@
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from job_store import JobStore
+from skill_matcher import TAXONOMY
+
+DEFAULT_PAIRS_PATH = 'skill_analysis/skill_pairs.csv'
+
+
+# A sparse boolean job x skill matrix: row i, column j is set when job i asks for skill j.
+#
+# Built once from per-job skill lists (extract_skills / JobRecord.skills);
+# every pair statistic is then a sparse matrix product or a NumPy operation
+# over the skills x skills result, so the cost grows with the number of
+# matches, not with jobs x pairs.
+class SkillMatrix:
+    def __init__(self, matrix, skills):
+        self.matrix = matrix
+        self.skills = skills
+        self.index = {skill: i for i, skill in enumerate(skills)}
+
+    # Function to build the matrix from an iterable of per-job skill lists.
+    # Columns follow the taxonomy order, so matrices from different runs line up;
+    # skills outside the taxonomy get extra columns at the end.
+    @classmethod
+    def from_skill_lists(cls, skill_lists, skills=None):
+        skills = list(skills) if skills is not None else [name for name, _ in TAXONOMY.skills]
+        index = {skill: i for i, skill in enumerate(skills)}
+        indices = []
+        indptr = [0]
+        for skills_list in skill_lists:
+            columns = set()
+            for skill in skills_list:
+                if skill not in index:
+                    index[skill] = len(skills)
+                    skills.append(skill)
+                columns.add(index[skill])
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.bool_)
+        matrix = sparse.csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+                                   shape=(len(indptr) - 1, len(skills)))
+        return cls(matrix, skills)
+
+    # Function to build the matrix from JobRecords, e.g. JobStore.iter_jobs()
+    @classmethod
+    def from_jobs(cls, jobs, skills=None):
+        return cls.from_skill_lists((job.skills for job in jobs), skills)
+
+    @property
+    def num_jobs(self):
+        return self.matrix.shape[0]
+
+    # Function to count the jobs asking for each skill
+    def counts(self):
+        return np.asarray(self.matrix.sum(axis=0, dtype=np.int64)).ravel()
+
+    # Function to count, for every pair of skills, the jobs asking for both (a dense skills x skills array)
+    def cooccurrence(self):
+        counts_matrix = self.matrix.astype(np.int32)
+        return (counts_matrix.T @ counts_matrix).toarray()
+
+    # Function to compute support, lift and PMI for every pair of skills seen together
+    # at least `min_count` times. Returns a DataFrame sorted by lift, highest first.
+    #   support = P(a and b), lift = P(a and b) / (P(a) P(b)), pmi = log2(lift)
+    def pair_stats(self, min_count=1):
+        together = self.cooccurrence()
+        counts = np.diag(together).astype(np.float64)
+        first, second = np.triu_indices(len(self.skills), k=1)
+        pair_counts = together[first, second]
+        keep = pair_counts >= max(min_count, 1)
+        first, second, pair_counts = first[keep], second[keep], pair_counts[keep].astype(np.int64)
+
+        total = max(self.num_jobs, 1)
+        lift = pair_counts * total / (counts[first] * counts[second])
+        skills = np.array(self.skills, dtype=object)
+        pairs = pd.DataFrame({
+            'Skill A': skills[first],
+            'Skill B': skills[second],
+            'Together': pair_counts,
+            'Count A': counts[first].astype(np.int64),
+            'Count B': counts[second].astype(np.int64),
+            'Support': pair_counts / total,
+            'Lift': lift,
+            'PMI': np.log2(lift),
+        })
+        return pairs.sort_values(['Lift', 'Together'], ascending=False, ignore_index=True)
+
+    # Function to report the top `k` pairs for each taxonomy category, ranked by `by`.
+    # A pair belongs to a category when either of its skills does.
+    def top_pairs_by_category(self, k=10, min_count=5, by='Lift', pairs=None):
+        if pairs is None:
+            pairs = self.pair_stats(min_count)
+        pairs = pairs.sort_values([by, 'Together'], ascending=False)
+        reports = []
+        for category, category_skills in TAXONOMY.categories.items():
+            in_category = pairs['Skill A'].isin(category_skills) | pairs['Skill B'].isin(category_skills)
+            top = pairs[in_category].head(k)
+            reports.append(top.assign(Category=category))
+        report = pd.concat(reports, ignore_index=True)
+        return report[['Category'] + [column for column in report.columns if column != 'Category']]
+
+
+# Function to write the per-category top pairs report to CSV
+def write_pair_report(skill_matrix, path=DEFAULT_PAIRS_PATH, k=10, min_count=5):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    report = skill_matrix.top_pairs_by_category(k, min_count)
+    report.to_csv(path, index=False)
+    print(f"Skill pairs for {report['Category'].nunique()} categories saved to: {path}")
+    return path
+
+
+# Main function
+if __name__ == "__main__":
+    store = JobStore()
+    skill_matrix = SkillMatrix.from_jobs(store.iter_jobs())
+    store.close()
+    print(f"{skill_matrix.num_jobs} jobs x {len(skill_matrix.skills)} skills, "
+          f"{skill_matrix.matrix.nnz} matches")
+
+    print("\nSkills most often asked for together (by lift, seen together in 5+ jobs):")
+    for row in skill_matrix.pair_stats(min_count=5).head(15).itertuples(index=False):
+        print(f"{row[0]} + {row[1]}: {row.Together} jobs, lift {row.Lift:.2f}, PMI {row.PMI:.2f}")
+
+    write_pair_report(skill_matrix)
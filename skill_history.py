@@ -0,0 +1,109 @@
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_HISTORY_PATH = 'skill_analysis/skill_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_at TEXT,
+    keyword TEXT,
+    total_jobs INTEGER
+);
+CREATE TABLE IF NOT EXISTS counts (
+    run_id INTEGER REFERENCES runs(run_id),
+    kind TEXT,
+    name TEXT,
+    count INTEGER
+);
+CREATE INDEX IF NOT EXISTS counts_by_run ON counts (run_id);
+"""
+
+
+# Append-only history of skill and category counts, one snapshot per crawl run.
+#
+# Every run adds a row to `runs` and its counts to `counts`; nothing is ever
+# updated or deleted. Queries load the history into one DataFrame and work on
+# it with pandas/NumPy (pivot, resample, diff, least-squares slopes), so no
+# old CSVs need to be re-read. `kind` is 'skill' or 'category'.
+class SkillHistory:
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    # Function to append a snapshot of a SkillAggregator; returns the new run ID
+    def record_run(self, aggregator, keyword, run_at=None):
+        run_at = (run_at or datetime.now()).isoformat(timespec='seconds')
+        with self._conn:
+            run_id = self._conn.execute("INSERT INTO runs (run_at, keyword, total_jobs) VALUES (?, ?, ?)",
+                                        (run_at, keyword, aggregator.total_jobs)).lastrowid
+            rows = [(run_id, 'skill', skill, count) for skill, count in aggregator.skill_counts.items()]
+            rows += [(run_id, 'category', category, count) for category, count in aggregator.category_counts.items()]
+            self._conn.executemany("INSERT INTO counts VALUES (?, ?, ?, ?)", rows)
+        print(f"Recorded skill snapshot {run_id} for {aggregator.total_jobs} jobs in: {self.path}")
+        return run_id
+
+    # Function to load the history as one long DataFrame: run_id, run_at, total_jobs, name, count
+    def frame(self, kind='skill', keyword=None):
+        query = ("SELECT runs.run_id, run_at, total_jobs, name, count FROM counts "
+                 "JOIN runs ON runs.run_id = counts.run_id WHERE kind = ?")
+        params = [kind]
+        if keyword is not None:
+            query += " AND keyword = ?"
+            params.append(keyword)
+        history = pd.read_sql_query(query, self._conn, params=params)
+        history['run_at'] = pd.to_datetime(history['run_at'])
+        return history
+
+    # Function to get each skill's share of jobs (in %) per run: one row per run, one column per skill.
+    # A skill missing from a run had no jobs that run, so it counts as 0%.
+    def share_over_time(self, kind='skill', keyword=None):
+        history = self.frame(kind, keyword)
+        history['share'] = history['count'] / history['total_jobs'] * 100
+        shares = history.pivot_table(index='run_at', columns='name', values='share', aggfunc='last')
+        return shares.fillna(0.0).sort_index()
+
+    # Function to get shares per week, using the last run of each week
+    def weekly_share(self, kind='skill', keyword=None):
+        return self.share_over_time(kind, keyword).resample('W').last().dropna(how='all')
+
+    # Function to get week-over-week changes in share, in percentage points.
+    # Only weeks directly after a week with a run have a change.
+    def week_over_week(self, kind='skill', keyword=None):
+        weekly = self.share_over_time(kind, keyword).resample('W').last()
+        return weekly.diff().dropna(how='all')
+
+    # Function to rank skills by how fast their share changed over the last `weeks` weeks.
+    # The trend is the least-squares slope of weekly share (percentage points per week),
+    # computed for every skill at once, over the latest streak of weeks that each had a run:
+    # a week without one breaks the streak. Returns (rising, falling) DataFrames of the top `top`.
+    def trending(self, kind='skill', keyword=None, weeks=4, top=10):
+        weekly = self.share_over_time(kind, keyword).resample('W').last().tail(weeks)
+        gaps = np.flatnonzero(weekly.isna().all(axis=1).to_numpy())
+        if len(gaps):
+            weekly = weekly.iloc[gaps[-1] + 1:]
+        if len(weekly) < 2:
+            empty = pd.DataFrame(columns=['Slope', 'Latest share', 'Change'])
+            return empty, empty
+
+        x = np.arange(len(weekly), dtype=np.float64)
+        x -= x.mean()
+        y = weekly.to_numpy()
+        slopes = x @ (y - y.mean(axis=0)) / (x @ x)
+        trends = pd.DataFrame({
+            'Slope': slopes,
+            'Latest share': y[-1],
+            'Change': y[-1] - y[0],
+        }, index=weekly.columns)
+        trends = trends.sort_values('Slope', ascending=False)
+        rising = trends[trends['Slope'] > 0].head(top)
+        falling = trends[trends['Slope'] < 0].iloc[::-1].head(top)
+        return rising, falling
+
+    def close(self):
+        self._conn.close()
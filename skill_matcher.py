@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import re
+
+from metrics import METRICS
+
+# The skill taxonomy lives in one data file next to this module
+TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+
+# A token is a run of letters/digits, optionally followed by "++" or "#" (C++, C#).
+# Anything else (spaces, "/", "-", ".", punctuation) separates tokens, which
+# gives word-boundary matching for free: "maintain" is never the token "ai".
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9]+(?:\+\+|#)?')
+
+
+# Function to split a skill name or a description into tokens
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text)
+
+
+# A skill taxonomy compiled into a token n-gram hash index.
+#
+# Each skill has a canonical name, optional aliases and one or more
+# categories. Every name and alias is tokenised once and stored under its
+# lowercase token tuple, so matching a description is one dictionary lookup
+# per (token, n-gram length) and runs in time linear in the description.
+# Skills marked "case_sensitive" (Go, R, Segment, ...) only match when the
+# description uses the same capitalisation as the taxonomy. `version` is a
+# hash of the entries, so results matched with an older taxonomy can be spotted.
+class SkillTaxonomy:
+    def __init__(self, entries):
+        self.version = hashlib.sha1(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()
+        self.skills = []
+        self.categories = {}
+        self._index = {}
+        self._lengths = {}
+
+        for entry in entries:
+            name = entry['name']
+            skill_id = len(self.skills)
+            self.skills.append((name, tuple(entry['categories'])))
+            for category in entry['categories']:
+                self.categories.setdefault(category, []).append(name)
+
+            case_sensitive = entry.get('case_sensitive', False)
+            for form in [name] + entry.get('aliases', []):
+                tokens = tuple(tokenize(form))
+                if not tokens:
+                    raise ValueError(f"Skill form {form!r} of {name!r} has no tokens")
+                key = tuple(token.lower() for token in tokens)
+                self._index.setdefault(key, []).append((skill_id, tokens if case_sensitive else None))
+                lengths = self._lengths.setdefault(key[0], set())
+                lengths.add(len(key))
+
+        # Longest n-grams first for each starting token
+        self._lengths = {first: sorted(lengths, reverse=True) for first, lengths in self._lengths.items()}
+
+    # Function to load the taxonomy from its JSON data file
+    @classmethod
+    def load(cls, path=TAXONOMY_PATH):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f)['skills'])
+
+    # Function to count skill mentions in a text, keyed by skill id
+    def count(self, text):
+        counts = {}
+        if not text:
+            return counts
+
+        tokens = tokenize(text)
+        lowered = [token.lower() for token in tokens]
+        lengths_for = self._lengths
+        index = self._index
+        total = len(tokens)
+
+        for i, first in enumerate(lowered):
+            lengths = lengths_for.get(first)
+            if lengths is None:
+                continue
+            for n in lengths:
+                if i + n > total:
+                    continue
+                entries = index.get(tuple(lowered[i:i + n]))
+                if entries is None:
+                    continue
+                for skill_id, exact_tokens in entries:
+                    if exact_tokens is not None and tuple(tokens[i:i + n]) != exact_tokens:
+                        continue
+                    counts[skill_id] = counts.get(skill_id, 0) + 1
+        return counts
+
+    # Function to find every skill and its categories in a text.
+    # Each canonical skill appears once in the skills list no matter how many
+    # aliases or categories matched, so counting the lists gives one vote per job.
+    def match(self, text):
+        skill_ids = sorted(self.count(text))
+        skills_list = [self.skills[skill_id][0] for skill_id in skill_ids]
+        found_skills = [(self.skills[skill_id][0], category)
+                        for skill_id in skill_ids
+                        for category in self.skills[skill_id][1]]
+        return skills_list, found_skills
+
+    # Function to map every skill name and alias to its canonical name
+    def canonical_names(self):
+        names = {}
+        for key, entries in self._index.items():
+            for skill_id, _ in entries:
+                names.setdefault(' '.join(key), self.skills[skill_id][0])
+        return names
+
+
+# Built once at import time and shared by every scraper
+TAXONOMY = SkillTaxonomy.load()
+
+# Category -> canonical skills, in taxonomy order
+SKILL_CATEGORIES = TAXONOMY.categories
+
+
+# Function to find every skill and its categories in one pass over the text
+@METRICS.timed('extract_skills', fine=True)
+def match_skills(text):
+    if not text:
+        return [], []
+    return TAXONOMY.match(text)
@@ -1,91 +1,10 @@
-skill_categories = {
-        'Databases': ['PostgreSQL', 'Snowflake', 'MongoDB', 'MySQL', 'Redshift', 'BigQuery', 'DynamoDB','NoSQL','hdfs'],
-        'Processing': ['Databricks', 'Spark', 'Hadoop', 'Hive', 'Pyspark', 'EMR', 'Dataproc', 'Synapse'],
-        'Cloud': ['AWS', 'Azure', 'GCP', 'S3', 'EC2', 'Lambda', 'Cloud Storage', 'Redshift'],
-        'Streaming': ['Kafka', 'Kinesis', 'PubSub', 'Pub/sub', 'event hub'],
-        'Orchestration': ['Airflow', 'NiFi', 'Prefect', 'Dagster', 'Luigi','Control-M','ADF'],
-        'Data Modeling': ['dbt', 'LookML', 'Data Warehouse', 'Star Schema', 'Dimensional Modeling'],
-        'ETL/ELT': ['Fivetran', 'Matillion', 'Alteryx', 'Informatica', 'Talend', 'ETL', 'ELT'],
-        'Data Governance': ['Collibra', 'Alation', 'Atlan', 'Data Catalog', 'Metadata Management'],
-        'Data Virtualization': ['Denodo', 'presto', 'Starburst', 'Immuta', 'Dremio', 'Trino'],
-        'Visualization': ['PowerBI', 'Tableau', 'Looker', 'Data Studio', 'Qlik'],
-        'Programming': ['Python', 'SQL', 'Java', 'Scala', 'Rust','Go', 'C++'],
-        'Concepts': ['Big Data', 'Machine Learning', 'AI', 'Data Modeling', 'Data Pipeline']
-    }
+# The skill lists used to be duplicated here and inside extract_skills.
+# They now come from the single taxonomy file, skill_taxonomy.json.
+from skill_matcher import SKILL_CATEGORIES, TAXONOMY
 
-skills_dict = {
-    # Databases and Data Warehouses
-    'Databases': [
-        'PostgreSQL', 'Snowflake', 'Databricks', 'Redshift', 'BigQuery', 'MongoDB', 'MySQL', 
-        'Cassandra', 'DynamoDB', 'HBase', 'Neo4j', 'Elasticsearch', 'Dremio', 'Delta Lake','NoSQL','HDFS','Redis','S3'
-    ],
-    
-    # Streaming and Messaging Systems
-    'Streaming': [
-        'Kafka', 'Kinesis', 'PubSub', 'Pub/sub', 'Event Hub', 'RabbitMQ', 'Apache Pulsar'
-    ],
-    
-    # Orchestration and Workflow Management
-    'Orchestration': [
-        'Airflow', 'dbt', 'NiFi', 'Luigi', 'Dagster', 'Prefect', 'Kubernetes','Control-M','ADF'
-    ],
-    
-    # Data Integration and ETL Tools
-    'Data_Integration': [
-        'Fivetran', 'Stitch', 'Segment', 'Matillion', 'Alteryx', 'Informatica', 'Talend', 
-        'AWS Glue', 'Azure Data Factory', 'Google Cloud Dataflow'
-    ],
-    
-    # Data Governance and Security
-    'Data_Governance_and_Security': [
-        'Collibra', 'Denodo', 'Immuta', 'Apache Ranger', 'Privacera', 'Alation','Metadata Management','Data Catalog','Atlan'
-    ],
-    
-    # Query Engines and Data Lake Tools
-    'Query_Engines_and Data_Lake_Tools': [
-        'Presto', 'Starburst', 'Trino', 'Apache Drill'
-    ],
-    
-    # Visualization and BI Tools
-    'Visualization_and_BI_Tools': [
-        'PowerBI', 'Tableau', 'Looker', 'Qlik', 'Sisense', 'Superset'
-    ],
-    
-    # Programming Languages
-    'Programming_Languages': [
-        'Python', 'SQL', 'PySpark', 'Java', 'Scala', 'R', 'Go', 'Rust', 'C++','Unix','Shell'
-    ],
-    
-    # Big Data Frameworks
-    'Big_Data_Frameworks': [
-        'Hadoop', 'Hive', 'Spark', 'Flink', 'Beam', 'Pig'
-    ],
-    
-    # Cloud Platforms and Services
-    'Cloud_Platforms_and_Services': [
-        'AWS', 'Azure', 'GCP', 'EMR', 'Dataproc', 'Synapse', 'Lambda', 'Step Functions'
-    ],
-    
-    # Machine Learning and AI Tools
-    'Machine_Learning_and_AI_Tools': [
-        'Machine Learning', 'AI', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'MLflow', 'Kubeflow'
-    ],
-    
-    # Data Concepts and Architectures
-    'Data_Concepts_and_Architectures': [
-        'ETL', 'ELT', 'Data Warehouse', 'Data Lake', 'Data Lakehouse', 'Big Data', 
-        'Data Modeling', 'Dimensional Modeling', 'Data Governance', 'Data Quality', 
-        'Data Lineage', 'Data Catalog', 'Data Mesh', 'Data Fabric', 'Serverless','Data Pipeline'
-    ],
-    
-    # DevOps and CI/CD Tools
-    'DevOps_and_CI/CD_Tools': [
-        'Docker', 'Kubernetes', 'Terraform', 'Jenkins', 'Git', 'GitHub Actions', 'CI/CD','Bitbucket','SVN'
-    ],
-    
-    # Soft Skills and Methodologies
-    'Soft_Skills_and_Methodologies': [
-        'Agile', 'Scrum', 'DevOps', 'Problem Solving', 'Collaboration', 'Documentation','Jira'
-    ]
-    ,'Concepts': ['Big Data', 'Machine Learning', 'AI', 'Data Modeling', 'Data Pipeline','ETL','ELT','ML','Data Warehouse','Unix']
-}
\ No newline at end of file
+# Category -> canonical skills
+skills_dict = SKILL_CATEGORIES
+skill_categories = SKILL_CATEGORIES
+
+# Alias (lowercase, space separated tokens) -> canonical skill
+skill_aliases = TAXONOMY.canonical_names()
@@ -0,0 +1,151 @@
+import time
+
+from metrics import METRICS
+
+# Upper bound, in seconds, for each kind of wait. A wait returns as soon as its
+# readiness signal fires, so these only matter on slow pages.
+STEP_TIMEOUTS = {
+    'page_load': 15,
+    'job_listings': 10,
+    'page_change': 10,
+    'pagination': 3,
+    'scroll': 5,
+    'expand': 3,
+    'description': 5,
+}
+
+# How often conditions are re-checked while waiting
+POLL_INTERVAL = 0.1
+
+# JavaScript that reports how many resources the page has requested so far.
+# When the count stops changing and the document is complete, the network is idle.
+RESOURCE_COUNT_JS = (
+    "return [document.readyState, performance.getEntriesByType('resource').length];"
+)
+
+
+# Function to poll a condition until it is true or the step's timeout runs out.
+# Errors raised by the condition (element not there yet, stale element) count
+# as "not ready". Returns the condition's last result, so a timeout is falsy.
+# Every wait is timed in METRICS as a 'wait' stage, with its poll sleeps and timeouts counted per step.
+def wait_until(driver, condition, step, timeout=None):
+    if timeout is None:
+        timeout = STEP_TIMEOUTS.get(step, 10)
+
+    start = time.monotonic()
+    deadline = start + timeout
+    result = False
+    sleeps = 0
+    while True:
+        try:
+            result = condition(driver)
+        except Exception:
+            result = False
+        if result or time.monotonic() >= deadline:
+            break
+        time.sleep(POLL_INTERVAL)
+        sleeps += 1
+
+    seconds = time.monotonic() - start
+    METRICS.record_time('wait', seconds, step=step)
+    if sleeps:
+        METRICS.count('sleeps', sleeps, step=step)
+    if not result:
+        METRICS.count('wait_timeouts', step=step)
+    return result
+
+
+# Function to print how long the waits recorded in METRICS took, per step
+def print_wait_summary():
+    report = METRICS.report()
+    timeouts = {counter['labels']['step']: counter['value']
+                for counter in report['counters'] if counter['name'] == 'wait_timeouts'}
+    for stage in report['stages']:
+        if stage['name'] == 'wait':
+            step = stage['labels']['step']
+            print(f"Waited for {step}: {stage['calls']} times, {stage['seconds']:.1f}s total, "
+                  f"{stage['max_seconds']:.1f}s max, {timeouts.get(step, 0)} timeouts")
+
+
+# Condition: no new resources were requested for `idle_for` seconds after the document loaded
+def network_idle(idle_for=0.5):
+    state = {'count': None, 'since': None}
+
+    def condition(driver):
+        ready_state, count = driver.execute_script(RESOURCE_COUNT_JS)
+        now = time.monotonic()
+        if ready_state != 'complete' or count != state['count']:
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= idle_for
+    return condition
+
+
+# Condition: at least `min_count` elements match and the count held steady for `stable_for` seconds.
+# Returns the matching elements once they are stable.
+def element_count_stable(by, selectors, min_count=1, stable_for=0.5):
+    state = {'count': None, 'since': None}
+
+    def condition(driver):
+        elements = []
+        for selector in selectors:
+            elements = driver.find_elements(by, selector)
+            if elements:
+                break
+        now = time.monotonic()
+        if len(elements) != state['count']:
+            state['count'], state['since'] = len(elements), now
+            return False
+        if len(elements) >= min_count and now - state['since'] >= stable_for:
+            return elements
+        return False
+    return condition
+
+
+# Condition: more elements match than before, e.g. after scrolling an infinite list
+def element_count_above(by, selector, previous_count):
+    def condition(driver):
+        return len(driver.find_elements(by, selector)) > previous_count
+    return condition
+
+
+# Condition: any element matching one of the selectors is present. Returns the first match.
+def any_element_present(by, selectors):
+    def condition(driver):
+        for selector in selectors:
+            elements = driver.find_elements(by, selector)
+            if elements:
+                return elements[0]
+        return False
+    return condition
+
+
+# Condition: the browser left the given URL or the page marker changed
+# (the marker is whatever identifies the current page, e.g. its first job's text)
+def page_changed(old_url, old_marker=None, marker=None):
+    def condition(driver):
+        if driver.current_url != old_url:
+            return True
+        return marker is not None and marker(driver) != old_marker
+    return condition
+
+
+# Condition: an element attribute has the expected value
+def attribute_equals(element, name, value):
+    def condition(driver):
+        return element.get_attribute(name) == value
+    return condition
+
+
+# Condition: true as soon as any of the given conditions is true
+def any_of(*conditions):
+    def condition(driver):
+        for check in conditions:
+            try:
+                result = check(driver)
+            except Exception:
+                continue
+            if result:
+                return result
+        return False
+    return condition